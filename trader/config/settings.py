@@ -1,62 +1,117 @@
 import os
-from typing import Dict, Any
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Dict
 from dotenv import load_dotenv
-from pydantic import validator
-from pydantic_settings import BaseSettings
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
 
 # Load environment variables
 load_dotenv()
 
-class TradingSettings(BaseSettings):
+def _load_env() -> Dict[str, str]:
+    """Snapshot os.environ once so each setting costs a single dict lookup"""
+    return dict(os.environ)
+
+def _get(env: Dict[str, str], name: str, default: Any, cast: Callable[[str], Any] = str) -> Any:
+    """Look up one setting, casting only when the variable is actually set"""
+    value = env.get(name)
+    if value is None:
+        return default
+    return cast(value)
+
+_BOOL = {'true': True, '1': True, 'yes': True, 'false': False, '0': False, 'no': False}
+
+def _env_bool(env: Dict[str, str], name: str, default: bool = False) -> bool:
+    """Look up a boolean setting, falling back to the default for unset or unknown values"""
+    value = env.get(name)
+    return _BOOL.get(value.strip().lower(), default) if value else default
+
+@dataclass(frozen=True)
+class TradingSettings:
     """Trading configuration settings"""
     
     # Dhan API Configuration
-    dhan_client_id: str = os.getenv('DHAN_CLIENT_ID', '')
-    dhan_access_token: str = os.getenv('DHAN_ACCESS_TOKEN', '')
+    dhan_client_id: str = ''
+    dhan_access_token: str = ''
     
     # Trading Parameters
-    nifty_symbol: str = os.getenv('NIFTY_SYMBOL', 'NIFTY')
-    default_quantity: int = int(os.getenv('DEFAULT_QUANTITY', '25'))
-    max_positions: int = int(os.getenv('MAX_POSITIONS', '5'))
-    risk_per_trade: float = float(os.getenv('RISK_PER_TRADE', '0.02'))
-    daily_loss_limit: float = float(os.getenv('DAILY_LOSS_LIMIT', '5000'))
-    portfolio_limit: float = float(os.getenv('PORTFOLIO_LIMIT', '100000'))
+    nifty_symbol: str = 'NIFTY'
+    default_quantity: int = 25
+    max_positions: int = 5
+    risk_per_trade: float = 0.02
+    daily_loss_limit: float = 5000
+    portfolio_limit: float = 100000
     
     # Market Hours
-    market_start_time: str = os.getenv('MARKET_START_TIME', '09:15')
-    market_end_time: str = os.getenv('MARKET_END_TIME', '15:30')
+    market_start_time: str = '09:15'
+    market_end_time: str = '15:30'
     
     # Notifications
-    telegram_bot_token: str = os.getenv('TELEGRAM_BOT_TOKEN', '')
-    telegram_chat_id: str = os.getenv('TELEGRAM_CHAT_ID', '')
-    enable_telegram_notifications: bool = os.getenv('ENABLE_TELEGRAM_NOTIFICATIONS', 'false').lower() == 'true'
+    telegram_bot_token: str = ''
+    telegram_chat_id: str = ''
+    enable_telegram_notifications: bool = False
     
     # Dashboard
-    dashboard_host: str = os.getenv('DASHBOARD_HOST', 'localhost')
-    dashboard_port: int = int(os.getenv('DASHBOARD_PORT', '8050'))
-    dashboard_debug: bool = os.getenv('DASHBOARD_DEBUG', 'false').lower() == 'true'
+    dashboard_host: str = 'localhost'
+    dashboard_port: int = 8050
+    dashboard_debug: bool = False
     
     # Database
-    database_url: str = os.getenv('DATABASE_URL', 'sqlite:///./trading_data.db')
+    database_url: str = 'sqlite:///./trading_data.db'
     
     # Logging
-    log_level: str = os.getenv('LOG_LEVEL', 'INFO')
-    log_file: str = os.getenv('LOG_FILE', 'logs/trading.log')
+    log_level: str = 'INFO'
+    log_file: str = 'logs/trading.log'
     
-    @validator('risk_per_trade')
-    def validate_risk_per_trade(cls, v):
-        if not 0 < v <= 0.1:  # Max 10% risk per trade
+    def __post_init__(self):
+        if not 0 < self.risk_per_trade <= 0.1:  # Max 10% risk per trade
             raise ValueError('Risk per trade must be between 0 and 0.1 (10%)')
-        return v
-    
-    @validator('default_quantity')
-    def validate_quantity(cls, v):
-        if v <= 0:
+        if self.default_quantity <= 0:
             raise ValueError('Default quantity must be positive')
-        return v
+    
+    @classmethod
+    def from_env(cls) -> 'TradingSettings':
+        """Build settings from a single snapshot of the environment"""
+        env = _load_env()
+        
+        if msgspec is not None:
+            # Coerce and validate every set variable in one native pass
+            values = {key.lower(): env[key] for key in _KNOWN_KEYS & env.keys()}
+            for name in _BOOL_FIELDS & values.keys():
+                values[name] = _env_bool(env, name.upper())
+            return msgspec.convert(values, cls, strict=False)
+        
+        return cls(
+            dhan_client_id=_get(env, 'DHAN_CLIENT_ID', ''),
+            dhan_access_token=_get(env, 'DHAN_ACCESS_TOKEN', ''),
+            nifty_symbol=_get(env, 'NIFTY_SYMBOL', 'NIFTY'),
+            default_quantity=_get(env, 'DEFAULT_QUANTITY', 25, int),
+            max_positions=_get(env, 'MAX_POSITIONS', 5, int),
+            risk_per_trade=_get(env, 'RISK_PER_TRADE', 0.02, float),
+            daily_loss_limit=_get(env, 'DAILY_LOSS_LIMIT', 5000.0, float),
+            portfolio_limit=_get(env, 'PORTFOLIO_LIMIT', 100000.0, float),
+            market_start_time=_get(env, 'MARKET_START_TIME', '09:15'),
+            market_end_time=_get(env, 'MARKET_END_TIME', '15:30'),
+            telegram_bot_token=_get(env, 'TELEGRAM_BOT_TOKEN', ''),
+            telegram_chat_id=_get(env, 'TELEGRAM_CHAT_ID', ''),
+            enable_telegram_notifications=_env_bool(env, 'ENABLE_TELEGRAM_NOTIFICATIONS'),
+            dashboard_host=_get(env, 'DASHBOARD_HOST', 'localhost'),
+            dashboard_port=_get(env, 'DASHBOARD_PORT', 8050, int),
+            dashboard_debug=_env_bool(env, 'DASHBOARD_DEBUG'),
+            database_url=_get(env, 'DATABASE_URL', 'sqlite:///./trading_data.db'),
+            log_level=_get(env, 'LOG_LEVEL', 'INFO'),
+            log_file=_get(env, 'LOG_FILE', 'logs/trading.log'),
+        )
+
+# Environment variable names recognised by TradingSettings.from_env()
+_KNOWN_KEYS = frozenset(f.name.upper() for f in fields(TradingSettings))
+_BOOL_FIELDS = frozenset(f.name for f in fields(TradingSettings) if f.type is bool)
 
 # Global settings instance
-settings = TradingSettings()
+settings = TradingSettings.from_env()
 
 # API Configuration
 DHAN_API_BASE_URL = "https://dhanhq.co/api"
@@ -3,24 +3,134 @@ Web-based dashboard for monitoring the Nifty options trading bot
 """
 
 import asyncio
-from typing import Dict, List, Any
+from typing import Any, Callable, Dict, List
+import hashlib
 import json
+import time
+from collections import deque
 from datetime import datetime
+from itertools import islice
 import threading
 
-# Dashboard framework imports (install if needed)
-try:
-    import dash
-    from dash import dcc, html, Input, Output, callback
-    import plotly.graph_objs as go
-    import plotly.express as px
-    DASH_AVAILABLE = True
-except ImportError:
-    DASH_AVAILABLE = False
-
 from src.utils.logger import TradingLogger
 from config.settings import settings
 
+# Dashboard framework names, populated on first use by _ensure_dash() so that
+# importing this module does not pay for loading dash and plotly
+dash = dash_table = dcc = html = Input = Output = State = go = None
+_dash_loaded = None
+
+def _ensure_dash() -> bool:
+    """Import dash and plotly once, returning whether they are installed"""
+    global dash, dash_table, dcc, html, Input, Output, State, go, _dash_loaded
+    
+    if _dash_loaded is None:
+        try:
+            import dash as _dash
+            from dash import dash_table as _dash_table, dcc as _dcc, html as _html
+            from dash import Input as _Input, Output as _Output, State as _State
+            import plotly.graph_objs as _go
+        except ImportError:
+            _dash_loaded = False
+        else:
+            dash, dash_table, dcc, html = _dash, _dash_table, _dcc, _html
+            Input, Output, State, go = _Input, _Output, _State, _go
+            _dash_loaded = True
+            
+            # Dash serializes callback payloads (including the dcc.Store
+            # snapshot) through plotly's JSON encoder; prefer orjson there
+            try:
+                import orjson  # noqa: F401
+                import plotly.io as pio
+                pio.json.config.default_engine = 'orjson'
+            except ImportError:
+                pass
+    
+    return _dash_loaded
+
+# Minimum seconds between bot refreshes while the market is closed, with
+# margin under the 60 s closed-market update interval
+_CLOSED_REFRESH_SECONDS = 55
+
+def _serve_with_hypercorn(server, host: str, port: int) -> bool:
+    """Serve a WSGI app in-process under hypercorn, returning False if it is not installed"""
+    try:
+        from asgiref.wsgi import WsgiToAsgi
+        from hypercorn.asyncio import serve
+        from hypercorn.config import Config
+    except ImportError:
+        return False
+    
+    try:
+        import uvloop
+    except ImportError:
+        uvloop = None
+    
+    config = Config()
+    config.bind = [f"{host}:{port}"]
+    config.keep_alive_timeout = 30
+    
+    # Without a shutdown_trigger hypercorn installs signal handlers, which only
+    # works on the main thread; if run() is called from any other thread, pass
+    # a trigger that never fires so it skips them
+    serve_kwargs = {}
+    if threading.current_thread() is not threading.main_thread():
+        serve_kwargs['shutdown_trigger'] = asyncio.Event().wait
+    
+    coro = serve(WsgiToAsgi(server), config, **serve_kwargs)
+    if uvloop is not None:
+        uvloop.run(coro)
+    else:
+        asyncio.run(coro)
+    return True
+
+def _serve_with_gunicorn(server, host: str, port: int, workers: int) -> bool:
+    """Serve a WSGI app under gunicorn, returning False if gunicorn is not installed"""
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        return False
+    
+    class _DashboardApplication(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', f"{host}:{port}")
+            self.cfg.set('workers', workers)
+            self.cfg.set('worker_class', 'gthread')
+            self.cfg.set('threads', 4)
+            self.cfg.set('keepalive', 30)
+        
+        def load(self):
+            return server
+    
+    _DashboardApplication().run()
+    return True
+
+def dash_available() -> bool:
+    """Check whether the dashboard dependencies can be imported"""
+    return _ensure_dash()
+
+# Render constants, built once instead of on every refresh
+_STATUS_COLOR = {'FILLED': 'green', 'OPEN': 'blue', 'CANCELLED': 'red', 'REJECTED': 'red'}
+_CURRENCY = "₹{:.2f}".format
+_MONEY_FORMAT = {'specifier': '$.2f', 'locale': {'symbol': ['₹', '']}}
+_PNL_STYLES = [
+    {'if': {'filter_query': '{total_pnl} >= 0', 'column_id': 'total_pnl'}, 'color': 'green'},
+    {'if': {'filter_query': '{total_pnl} < 0', 'column_id': 'total_pnl'}, 'color': 'red'}
+]
+_ORDER_STATUS_STYLES = [
+    {'if': {'filter_query': f'{{status}} = "{status}"', 'column_id': 'status'}, 'color': color}
+    for status, color in _STATUS_COLOR.items()
+]
+
+def _digest(obj: Any) -> str:
+    """Stable short digest of a JSON-serializable value, used for change detection"""
+    payload = json.dumps(obj, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(payload, digest_size=8).hexdigest()
+
+def _tail(points: deque, count: int) -> List[Any]:
+    """Return the last ``count`` entries of a bounded deque as a list"""
+    return list(islice(points, max(0, len(points) - count), None))
+
 class TradingDashboard:
     """Web dashboard for monitoring trading activities"""
     
@@ -31,10 +141,15 @@ class TradingDashboard:
         
         # Dashboard data
         self.dashboard_data = {
-            'nifty_prices': [],
+            # Time series are stored as parallel deques (one per field), with
+            # timestamps kept as epoch seconds until a chart needs them
+            'nifty_ts': deque(maxlen=200),
+            'nifty_px': deque(maxlen=200),
             'positions': [],
             'orders': [],
-            'pnl_history': [],
+            'pnl_ts': deque(maxlen=100),
+            'pnl_cum': deque(maxlen=100),
+            'pnl_daily': deque(maxlen=100),
             'strategy_performance': {},
             'market_status': {},
             'risk_metrics': {}
@@ -42,8 +157,12 @@ class TradingDashboard:
         
         # Update intervals
         self.update_interval = 5000  # 5 seconds in milliseconds
+        self.closed_update_interval = 60000  # 1 minute while the market is closed
+        
+        # Monotonic time of the last full refresh from the trading bot
+        self._last_full_refresh = float('-inf')
         
-        if DASH_AVAILABLE:
+        if dash_available():
             self._create_dashboard()
     
     def _create_dashboard(self):
@@ -117,6 +236,12 @@ class TradingDashboard:
                     html.Div(id="strategy-performance")
                 ], style={'padding': '20px'}),
                 
+                # Latest data snapshot shared by all render callbacks
+                dcc.Store(id='dash-store'),
+                dcc.Store(id='positions-hash'),
+                dcc.Store(id='orders-hash'),
+                dcc.Store(id='strategy-performance-hash'),
+                
                 # Auto-refresh interval
                 dcc.Interval(
                     id='interval-component',
@@ -136,72 +261,128 @@ class TradingDashboard:
     def _register_callbacks(self):
         """Register Dash callbacks for real-time updates"""
         
+        # A single callback refreshes the data once per tick and publishes a
+        # snapshot to the store; the render callbacks below only format it
+        @self.app.callback(
+            Output('dash-store', 'data'),
+            [Input('interval-component', 'n_intervals')]
+        )
+        def refresh_store(n):
+            self._refresh_dashboard_data()
+            return self._snapshot()
+        
+        # Slow the browser's polling down while the market is closed
+        self.app.clientside_callback(
+            f"""
+            function(data) {{
+                var open = data && data.market_status && data.market_status.is_open;
+                return open ? {self.update_interval} : {self.closed_update_interval};
+            }}
+            """,
+            Output('interval-component', 'interval'),
+            [Input('dash-store', 'data')]
+        )
+        
         @self.app.callback(
             [Output('market-status', 'children'),
              Output('positions-count', 'children'),
              Output('daily-pnl', 'children'),
              Output('total-pnl', 'children')],
-            [Input('interval-component', 'n_intervals')]
+            [Input('dash-store', 'data')]
         )
-        def update_status_cards(n):
-            return self._update_status_cards()
+        def update_status_cards(data):
+            return self._update_status_cards(data or {})
         
         @self.app.callback(
             Output('nifty-price-chart', 'figure'),
-            [Input('interval-component', 'n_intervals')]
+            [Input('dash-store', 'data')]
         )
-        def update_nifty_chart(n):
-            return self._create_nifty_chart()
+        def update_nifty_chart(data):
+            return self._create_nifty_chart(data or {})
         
         @self.app.callback(
             Output('pnl-chart', 'figure'),
-            [Input('interval-component', 'n_intervals')]
+            [Input('dash-store', 'data')]
         )
-        def update_pnl_chart(n):
-            return self._create_pnl_chart()
+        def update_pnl_chart(data):
+            return self._create_pnl_chart(data or {})
         
+        # Tables and strategy cards change far less often than the tick rate;
+        # each keeps the digest of what it last rendered in a per-client store
         @self.app.callback(
-            Output('positions-table', 'children'),
-            [Input('interval-component', 'n_intervals')]
+            [Output('positions-table', 'children'),
+             Output('positions-hash', 'data')],
+            [Input('dash-store', 'data')],
+            [State('positions-hash', 'data')]
         )
-        def update_positions_table(n):
-            return self._create_positions_table()
+        def update_positions_table(data, last_hash):
+            data = data or {}
+            return self._render_if_changed(data.get('positions'), last_hash,
+                                           lambda: self._create_positions_table(data))
         
         @self.app.callback(
-            Output('orders-table', 'children'),
-            [Input('interval-component', 'n_intervals')]
+            [Output('orders-table', 'children'),
+             Output('orders-hash', 'data')],
+            [Input('dash-store', 'data')],
+            [State('orders-hash', 'data')]
         )
-        def update_orders_table(n):
-            return self._create_orders_table()
+        def update_orders_table(data, last_hash):
+            data = data or {}
+            return self._render_if_changed(data.get('orders'), last_hash,
+                                           lambda: self._create_orders_table(data))
         
         @self.app.callback(
-            Output('strategy-performance', 'children'),
-            [Input('interval-component', 'n_intervals')]
+            [Output('strategy-performance', 'children'),
+             Output('strategy-performance-hash', 'data')],
+            [Input('dash-store', 'data')],
+            [State('strategy-performance-hash', 'data')]
         )
-        def update_strategy_performance(n):
-            return self._create_strategy_performance()
+        def update_strategy_performance(data, last_hash):
+            data = data or {}
+            return self._render_if_changed(data.get('strategy_performance'), last_hash,
+                                           lambda: self._create_strategy_performance(data))
+    
+    def _render_if_changed(self, section: Any, last_hash: str, render: Callable[[], Any]):
+        """Render a section only when its content differs from the last render"""
+        digest = _digest(section)
+        if digest == last_hash:
+            return dash.no_update, dash.no_update
+        return render(), digest
     
-    def _update_status_cards(self):
+    def _snapshot(self) -> Dict[str, Any]:
+        """Build the JSON-serializable view of dashboard data sent to the store"""
+        data = self.dashboard_data
+        return {
+            'market_status': data['market_status'],
+            'risk_metrics': data['risk_metrics'],
+            'positions': data['positions'],
+            'orders': data['orders'][-10:],
+            'strategy_performance': data['strategy_performance'],
+            'nifty_ts': _tail(data['nifty_ts'], 100),
+            'nifty_px': _tail(data['nifty_px'], 100),
+            'pnl_ts': _tail(data['pnl_ts'], 50),
+            'pnl_cum': _tail(data['pnl_cum'], 50)
+        }
+    
+    def _update_status_cards(self, data: Dict[str, Any]):
         """Update status card data"""
         try:
-            # Update dashboard data
-            self._refresh_dashboard_data()
-            
             # Market status
-            market_status = "🟢 Open" if self.dashboard_data['market_status'].get('is_open') else "🔴 Closed"
+            market_status = "🟢 Open" if data.get('market_status', {}).get('is_open') else "🔴 Closed"
             
             # Positions count
-            positions_count = len(self.dashboard_data['positions'])
+            positions_count = len(data.get('positions', []))
             
             # Daily P&L
-            daily_pnl = self.dashboard_data['risk_metrics'].get('daily_pnl', 0)
+            risk_metrics = data.get('risk_metrics', {})
+            daily_pnl = risk_metrics.get('daily_pnl', 0)
             daily_pnl_color = 'green' if daily_pnl >= 0 else 'red'
-            daily_pnl_text = html.Span(f"₹{daily_pnl:.2f}", style={'color': daily_pnl_color, 'fontSize': '24px', 'fontWeight': 'bold'})
+            daily_pnl_text = html.Span(_CURRENCY(daily_pnl), style={'color': daily_pnl_color, 'fontSize': '24px', 'fontWeight': 'bold'})
             
             # Total P&L
-            total_pnl = self.dashboard_data['risk_metrics'].get('total_pnl', 0)
+            total_pnl = risk_metrics.get('total_pnl', 0)
             total_pnl_color = 'green' if total_pnl >= 0 else 'red'
-            total_pnl_text = html.Span(f"₹{total_pnl:.2f}", style={'color': total_pnl_color, 'fontSize': '24px', 'fontWeight': 'bold'})
+            total_pnl_text = html.Span(_CURRENCY(total_pnl), style={'color': total_pnl_color, 'fontSize': '24px', 'fontWeight': 'bold'})
             
             return market_status, str(positions_count), daily_pnl_text, total_pnl_text
             
@@ -209,18 +390,16 @@ class TradingDashboard:
             self.logger.logger.error(f"Error updating status cards: {e}")
             return "Error", "Error", "Error", "Error"
     
-    def _create_nifty_chart(self):
+    def _create_nifty_chart(self, data: Dict[str, Any]):
         """Create Nifty price chart"""
         try:
-            if not self.dashboard_data['nifty_prices']:
+            if not data.get('nifty_px'):
                 return go.Figure()
             
-            df_data = self.dashboard_data['nifty_prices'][-100:]  # Last 100 points
-            
             fig = go.Figure()
             fig.add_trace(go.Scatter(
-                x=[point['timestamp'] for point in df_data],
-                y=[point['price'] for point in df_data],
+                x=[datetime.fromtimestamp(ts) for ts in data['nifty_ts']],
+                y=data['nifty_px'],
                 mode='lines',
                 name='Nifty 50',
                 line=dict(color='blue', width=2)
@@ -240,18 +419,16 @@ class TradingDashboard:
             self.logger.logger.error(f"Error creating Nifty chart: {e}")
             return go.Figure()
     
-    def _create_pnl_chart(self):
+    def _create_pnl_chart(self, data: Dict[str, Any]):
         """Create P&L chart"""
         try:
-            if not self.dashboard_data['pnl_history']:
+            if not data.get('pnl_cum'):
                 return go.Figure()
             
-            df_data = self.dashboard_data['pnl_history'][-50:]  # Last 50 points
-            
             fig = go.Figure()
             fig.add_trace(go.Scatter(
-                x=[point['timestamp'] for point in df_data],
-                y=[point['cumulative_pnl'] for point in df_data],
+                x=[datetime.fromtimestamp(ts) for ts in data['pnl_ts']],
+                y=data['pnl_cum'],
                 mode='lines',
                 name='Cumulative P&L',
                 line=dict(color='green', width=2),
@@ -272,107 +449,87 @@ class TradingDashboard:
             self.logger.logger.error(f"Error creating P&L chart: {e}")
             return go.Figure()
     
-    def _create_positions_table(self):
+    def _create_positions_table(self, data: Dict[str, Any]):
         """Create positions table"""
         try:
-            if not self.dashboard_data['positions']:
+            positions = data.get('positions')
+            if not positions:
                 return html.P("No active positions")
             
-            # Create table rows
-            rows = []
-            for pos in self.dashboard_data['positions']:
-                pnl_color = 'green' if pos.get('total_pnl', 0) >= 0 else 'red'
-                rows.append(html.Tr([
-                    html.Td(pos.get('symbol', 'N/A')),
-                    html.Td(str(pos.get('quantity', 0))),
-                    html.Td(f"₹{pos.get('avg_price', 0):.2f}"),
-                    html.Td(f"₹{pos.get('market_price', 0):.2f}"),
-                    html.Td(f"₹{pos.get('total_pnl', 0):.2f}", style={'color': pnl_color}),
-                    html.Td(pos.get('strategy', 'N/A'))
-                ]))
-            
-            table = html.Table([
-                html.Thead([
-                    html.Tr([
-                        html.Th('Symbol'),
-                        html.Th('Quantity'),
-                        html.Th('Avg Price'),
-                        html.Th('Market Price'),
-                        html.Th('P&L'),
-                        html.Th('Strategy')
-                    ])
-                ]),
-                html.Tbody(rows)
-            ], style={'width': '100%', 'textAlign': 'center'})
-            
-            return table
+            return dash_table.DataTable(
+                columns=[
+                    {'name': 'Symbol', 'id': 'symbol'},
+                    {'name': 'Quantity', 'id': 'quantity', 'type': 'numeric'},
+                    {'name': 'Avg Price', 'id': 'avg_price', 'type': 'numeric', 'format': _MONEY_FORMAT},
+                    {'name': 'Market Price', 'id': 'market_price', 'type': 'numeric', 'format': _MONEY_FORMAT},
+                    {'name': 'P&L', 'id': 'total_pnl', 'type': 'numeric', 'format': _MONEY_FORMAT},
+                    {'name': 'Strategy', 'id': 'strategy'}
+                ],
+                data=[{
+                    'symbol': pos.get('symbol', 'N/A'),
+                    'quantity': pos.get('quantity', 0),
+                    'avg_price': pos.get('avg_price', 0),
+                    'market_price': pos.get('market_price', 0),
+                    'total_pnl': pos.get('total_pnl', 0),
+                    'strategy': pos.get('strategy', 'N/A')
+                } for pos in positions],
+                style_cell={'textAlign': 'center'},
+                style_data_conditional=_PNL_STYLES
+            )
             
         except Exception as e:
             self.logger.logger.error(f"Error creating positions table: {e}")
             return html.P("Error loading positions")
     
-    def _create_orders_table(self):
+    def _create_orders_table(self, data: Dict[str, Any]):
         """Create recent orders table"""
         try:
-            if not self.dashboard_data['orders']:
+            # The snapshot already holds only the last 10 orders
+            recent_orders = data.get('orders')
+            if not recent_orders:
                 return html.P("No recent orders")
             
-            # Get last 10 orders
-            recent_orders = self.dashboard_data['orders'][-10:]
-            
-            rows = []
-            for order in recent_orders:
-                status_color = {
-                    'FILLED': 'green',
-                    'OPEN': 'blue',
-                    'CANCELLED': 'red',
-                    'REJECTED': 'red'
-                }.get(order.get('status'), 'black')
-                
-                rows.append(html.Tr([
-                    html.Td(order.get('symbol', 'N/A')),
-                    html.Td(order.get('side', 'N/A')),
-                    html.Td(str(order.get('quantity', 0))),
-                    html.Td(f"₹{order.get('price', 0):.2f}"),
-                    html.Td(order.get('status', 'N/A'), style={'color': status_color}),
-                    html.Td(order.get('created_at', 'N/A')[:19] if order.get('created_at') else 'N/A')
-                ]))
-            
-            table = html.Table([
-                html.Thead([
-                    html.Tr([
-                        html.Th('Symbol'),
-                        html.Th('Side'),
-                        html.Th('Quantity'),
-                        html.Th('Price'),
-                        html.Th('Status'),
-                        html.Th('Time')
-                    ])
-                ]),
-                html.Tbody(rows)
-            ], style={'width': '100%', 'textAlign': 'center'})
-            
-            return table
+            return dash_table.DataTable(
+                columns=[
+                    {'name': 'Symbol', 'id': 'symbol'},
+                    {'name': 'Side', 'id': 'side'},
+                    {'name': 'Quantity', 'id': 'quantity', 'type': 'numeric'},
+                    {'name': 'Price', 'id': 'price', 'type': 'numeric', 'format': _MONEY_FORMAT},
+                    {'name': 'Status', 'id': 'status'},
+                    {'name': 'Time', 'id': 'created_at'}
+                ],
+                data=[{
+                    'symbol': order.get('symbol', 'N/A'),
+                    'side': order.get('side', 'N/A'),
+                    'quantity': order.get('quantity', 0),
+                    'price': order.get('price', 0),
+                    'status': order.get('status', 'N/A'),
+                    'created_at': order['created_at'][:19] if order.get('created_at') else 'N/A'
+                } for order in recent_orders],
+                style_cell={'textAlign': 'center'},
+                style_data_conditional=_ORDER_STATUS_STYLES
+            )
             
         except Exception as e:
             self.logger.logger.error(f"Error creating orders table: {e}")
             return html.P("Error loading orders")
     
-    def _create_strategy_performance(self):
+    def _create_strategy_performance(self, data: Dict[str, Any]):
         """Create strategy performance display"""
         try:
-            if not self.dashboard_data['strategy_performance']:
+            strategy_performance = data.get('strategy_performance')
+            if not strategy_performance:
                 return html.P("No strategy data available")
             
             strategy_cards = []
-            for strategy_name, performance in self.dashboard_data['strategy_performance'].items():
+            for strategy_name, performance in strategy_performance.items():
                 win_rate = performance.get('win_rate', 0)
                 win_rate_color = 'green' if win_rate >= 60 else 'orange' if win_rate >= 40 else 'red'
                 
                 card = html.Div([
                     html.H4(strategy_name),
                     html.P(f"Trades: {performance.get('total_trades', 0)}"),
-                    html.P(f"P&L: ₹{performance.get('pnl_today', 0):.2f}"),
+                    html.P("P&L: " + _CURRENCY(performance.get('pnl_today', 0))),
                     html.P(f"Win Rate: {win_rate:.1f}%", style={'color': win_rate_color}),
                     html.P(f"Status: {'🟢' if performance.get('running') else '🔴'}")
                 ], style={
@@ -399,21 +556,26 @@ class TradingDashboard:
             if not self.trading_bot:
                 return
             
+            # One timestamp per refresh, shared by every series appended below
+            now = time.time()
+            
             # Update market status
             from src.utils.helpers import get_market_status
             self.dashboard_data['market_status'] = get_market_status()
             
+            # Values cannot move outside market hours, so keep the last
+            # snapshot and only query the bot about once a minute. The gate
+            # sits below the 60 s closed-market interval so timer jitter
+            # does not skip every other tick.
+            if (not self.dashboard_data['market_status'].get('is_open')
+                    and time.monotonic() - self._last_full_refresh < _CLOSED_REFRESH_SECONDS):
+                return
+            
             # Update Nifty prices
             nifty_price = self.trading_bot.data_manager.get_nifty_price()
             if nifty_price:
-                self.dashboard_data['nifty_prices'].append({
-                    'timestamp': datetime.now(),
-                    'price': nifty_price
-                })
-                
-                # Keep only last 200 points
-                if len(self.dashboard_data['nifty_prices']) > 200:
-                    self.dashboard_data['nifty_prices'] = self.dashboard_data['nifty_prices'][-200:]
+                self.dashboard_data['nifty_ts'].append(now)
+                self.dashboard_data['nifty_px'].append(nifty_price)
             
             # Update positions
             positions = self.trading_bot.position_manager.get_positions()
@@ -426,15 +588,9 @@ class TradingDashboard:
             total_pnl = self.trading_bot.position_manager.get_total_pnl()
             daily_pnl = self.trading_bot.position_manager.daily_pnl
             
-            self.dashboard_data['pnl_history'].append({
-                'timestamp': datetime.now(),
-                'cumulative_pnl': total_pnl,
-                'daily_pnl': daily_pnl
-            })
-            
-            # Keep only last 100 points
-            if len(self.dashboard_data['pnl_history']) > 100:
-                self.dashboard_data['pnl_history'] = self.dashboard_data['pnl_history'][-100:]
+            self.dashboard_data['pnl_ts'].append(now)
+            self.dashboard_data['pnl_cum'].append(total_pnl)
+            self.dashboard_data['pnl_daily'].append(daily_pnl)
             
             # Update risk metrics
             self.dashboard_data['risk_metrics'] = self.trading_bot.position_manager.get_risk_summary()
@@ -443,13 +599,15 @@ class TradingDashboard:
             self.dashboard_data['strategy_performance'] = {}
             for strategy_name, strategy in self.trading_bot.strategies.items():
                 self.dashboard_data['strategy_performance'][strategy_name] = strategy.get_performance_summary()
+            
+            self._last_full_refresh = time.monotonic()
                 
         except Exception as e:
             self.logger.logger.error(f"Error refreshing dashboard data: {e}")
     
     def run(self, host='localhost', port=8050, debug=False):
         """Run the dashboard"""
-        if not DASH_AVAILABLE:
+        if not dash_available():
             self.logger.logger.error("Dash not available. Install with: pip install dash plotly")
             return
         
@@ -459,7 +617,16 @@ class TradingDashboard:
         
         try:
             self.logger.logger.info(f"Starting dashboard on http://{host}:{port}")
-            self.app.run_server(host=host, port=port, debug=debug, threaded=True)
+            
+            # Outside debug mode prefer hypercorn, which serves requests
+            # concurrently in this process, then gunicorn's threaded workers.
+            # Gunicorn forks (so workers would serve a copy of a live bot's
+            # state frozen at fork time) and takes over signals and exit, so
+            # it is only used for a standalone dashboard.
+            if debug or not (_serve_with_hypercorn(self.app.server, host, port)
+                             or (self.trading_bot is None
+                                 and _serve_with_gunicorn(self.app.server, host, port, workers=2))):
+                self.app.run_server(host=host, port=port, debug=debug, threaded=True)
             
         except Exception as e:
             self.logger.logger.error(f"Error running dashboard: {e}")
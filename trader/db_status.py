@@ -1,51 +1,106 @@
 #!/usr/bin/env python3
 
+import contextlib
+import functools
+import io
 import sqlite3
-from datetime import datetime
+import sys
+from time import localtime, strftime
 import os
+from pathlib import Path
 
-def main():
+from src.utils.helpers import tail_lines
+
+DB_PATH = 'data/trading_data.db'
+
+# New market data goes to one market_YYYY-MM-DD.db file per day next to DB_PATH
+SHARD_GLOB = 'market_*.db'
+
+@functools.lru_cache(maxsize=1)
+def _conn():
+    """Open (once) a read-only, memory-mapped connection to the trading database"""
+    conn = sqlite3.connect(f'file:{DB_PATH}?mode=ro&cache=shared', uri=True)
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA query_only=ON")
+    conn.execute("PRAGMA cache_size=-20000")
+    return conn
+
+def shard_tick_count():
+    """Return (number of daily market data files, total rows across them)"""
+    shards = sorted(Path(DB_PATH).parent.glob(SHARD_GLOB))
+    total = 0
+    for shard in shards:
+        conn = sqlite3.connect(f'file:{shard}?mode=ro', uri=True)
+        try:
+            total += conn.execute("SELECT COUNT(*) FROM market_data").fetchone()[0]
+        except sqlite3.Error:
+            pass  # file created but not yet initialized
+        finally:
+            conn.close()
+    return len(shards), total
+
+def _report():
     print("📊 TRADING DATABASE STATUS")
     print("=" * 50)
-    print(f"⏰ Current Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"⏰ Current Time: {strftime('%Y-%m-%d %H:%M:%S', localtime())}")
     print()
     
     # Check if database exists
-    if not os.path.exists('data/trading_data.db'):
+    if not os.path.exists(DB_PATH):
         print("❌ Database file not found!")
         return
     
-    # Connect to database
-    conn = sqlite3.connect('data/trading_data.db')
-    cursor = conn.cursor()
+    # Connect to database (reused across calls when run from a scheduler)
+    cursor = _conn().cursor()
     
     # Table record counts
     tables = {
         'orders': 'Trading Orders',
         'trades': 'Executed Trades', 
         'positions': 'Open Positions',
-        'market_data': 'Market Data Points',
+        'market_data': 'Market Data (pre-shard)',
         'daily_performance': 'Daily Performance Records',
         'strategy_performance': 'Strategy Performance',
         'risk_events': 'Risk Events'
     }
     
     print("📋 TABLE STATUS:")
+    
+    # Count only tables that exist, all in one UNION ALL query
+    placeholders = ",".join("?" * len(tables))
+    cursor.execute(
+        f"SELECT name FROM sqlite_master WHERE type='table' AND name IN ({placeholders})",
+        tuple(tables)
+    )
+    existing = {row[0] for row in cursor.fetchall()}
+    
+    counts = {}
+    if existing:
+        sql = " UNION ALL ".join(
+            f"SELECT '{table}' AS t, COUNT(*) AS c FROM {table}" for table in tables if table in existing
+        )
+        cursor.execute(sql)
+        counts = dict(cursor.fetchall())
+    
     total_records = 0
     for table, description in tables.items():
-        try:
-            cursor.execute(f'SELECT COUNT(*) FROM {table}')
-            count = cursor.fetchone()[0]
+        if table in counts:
+            count = counts[table]
             total_records += count
             status = '✅ Active' if count > 0 else '⭕ Empty'
             print(f"  {description:25}: {count:>5} records {status}")
-        except Exception as e:
-            print(f"  {description:25}: ❌ Error - {e}")
+        else:
+            print(f"  {description:25}: ❌ Error - no such table: {table}")
+    
+    shard_count, shard_ticks = shard_tick_count()
+    total_records += shard_ticks
+    status = '✅ Active' if shard_ticks > 0 else '⭕ Empty'
+    print(f"  {'Market Data (daily files)':25}: {shard_ticks:>5} records {status} ({shard_count} files)")
     
     print(f"\n📊 TOTAL RECORDS: {total_records}")
     
     # Database file info
-    size = os.path.getsize('data/trading_data.db')
+    size = os.path.getsize(DB_PATH)
     print(f"💾 DATABASE SIZE: {size:,} bytes ({size/1024:.1f} KB)")
     
     # Show table structure for one key table
@@ -58,16 +113,22 @@ def main():
         null_str = " NOT NULL" if not_null else ""
         print(f"  - {name}: {data_type}{pk_str}{null_str}")
     
-    conn.close()
     print(f"\n✅ Database is healthy and ready for trading data!")
     
     # Show recent system activity from logs
     if os.path.exists('logs/trading_20250809.log'):
         print(f"\n📝 RECENT SYSTEM ACTIVITY:")
-        with open('logs/trading_20250809.log', 'r') as f:
-            lines = f.readlines()[-5:]  # Last 5 lines
-            for line in lines:
-                print(f"  {line.strip()}")
+        for line in tail_lines('logs/trading_20250809.log', 5):  # Last 5 lines
+            print(f"  {line.strip()}")
+
+def main():
+    """Print the database status report with a single buffered write"""
+    buf = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buf):
+            _report()
+    finally:
+        sys.stdout.write(buf.getvalue())
 
 if __name__ == "__main__":
     main()
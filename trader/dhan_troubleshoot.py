@@ -3,11 +3,16 @@
 Dhan API credential troubleshooting and validation script
 """
 
+import contextlib
+import io
 import os
+import sys
 from dotenv import load_dotenv
 import requests
+from requests.adapters import HTTPAdapter
 import json
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from time import localtime, strftime
 
 def check_environment():
     """Check environment variables"""
@@ -34,6 +39,21 @@ def check_environment():
     
     return client_id, access_token
 
+def _probe(session, url, headers, timeout):
+    """Probe one URL, sending HEAD first and only issuing a GET when it may succeed"""
+    response = session.head(url, headers=headers, timeout=3, allow_redirects=False)
+    if response.status_code not in (200, 401, 405):
+        return response.status_code, ''
+    
+    response = session.get(url, headers=headers, timeout=timeout, stream=True)
+    try:
+        snippet = ''
+        if response.status_code != 200:
+            snippet = response.raw.read(200).decode('utf-8', errors='replace')
+        return response.status_code, snippet
+    finally:
+        response.close()
+
 def test_dhan_api_endpoints(client_id, access_token):
     """Test different Dhan API endpoints"""
     print(f"\n🌐 TESTING DHAN API ENDPOINTS")
@@ -68,39 +88,65 @@ def test_dhan_api_endpoints(client_id, access_token):
         'Authorization': f'Bearer {access_token}'
     }
     
+    # Probe every (base URL, endpoint, header set) combination concurrently
+    # over one pooled session so TLS connections are reused between probes
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16)
+    session.mount('https://', adapter)
+    
+    probes = []
     for base_url in base_urls:
-        print(f"\n🔗 Testing base URL: {base_url}")
         for endpoint in endpoints:
-            full_url = base_url + endpoint
+            probes.append((base_url, endpoint, headers, False, 10))
+            probes.append((base_url, endpoint, alternate_headers, True, 5))
+    
+    print(f"\n🔗 Testing {len(base_urls)} base URLs x {len(endpoints)} endpoints")
+    
+    executor = ThreadPoolExecutor(max_workers=8)
+    try:
+        futures = {
+            executor.submit(_probe, session, base_url + endpoint, probe_headers, timeout):
+                (base_url, endpoint, alternate)
+            for base_url, endpoint, probe_headers, alternate, timeout in probes
+        }
+        
+        for future in as_completed(futures):
+            base_url, endpoint, alternate = futures[future]
+            label = f"{base_url}{endpoint}"
+            
+            # Test with alternate headers
+            if alternate:
+                try:
+                    if future.result()[0] == 200:
+                        print(f"  ✅ {label} (alt headers): SUCCESS")
+                        return True, base_url, endpoint
+                except:
+                    pass
+                continue
             
             # Test with original headers
             try:
-                response = requests.get(full_url, headers=headers, timeout=10)
-                status = response.status_code
+                status, body = future.result()
                 
                 if status == 200:
-                    print(f"  ✅ {endpoint}: SUCCESS (200)")
+                    print(f"  ✅ {label}: SUCCESS (200)")
                     return True, base_url, endpoint
                 elif status == 401:
-                    print(f"  🔐 {endpoint}: Unauthorized (401) - Check credentials")
+                    print(f"  🔐 {label}: Unauthorized (401) - Check credentials")
                 elif status == 404:
-                    print(f"  ❌ {endpoint}: Not Found (404)")
+                    print(f"  ❌ {label}: Not Found (404)")
                 elif status == 403:
-                    print(f"  🚫 {endpoint}: Forbidden (403)")
+                    print(f"  🚫 {label}: Forbidden (403)")
                 else:
-                    print(f"  ⚠️  {endpoint}: {status} - {response.text[:100]}")
+                    print(f"  ⚠️  {label}: {status} - {body[:100]}")
                     
             except requests.exceptions.RequestException as e:
-                print(f"  ⚡ {endpoint}: Connection Error - {str(e)[:50]}")
-                
-            # Test with alternate headers
-            try:
-                response = requests.get(full_url, headers=alternate_headers, timeout=5)
-                if response.status_code == 200:
-                    print(f"  ✅ {endpoint} (alt headers): SUCCESS")
-                    return True, base_url, endpoint
-            except:
-                pass
+                print(f"  ⚡ {label}: Connection Error - {str(e)[:50]}")
+    finally:
+        # Drop queued probes but let running ones (bounded by their request
+        # timeout) finish before their session is closed underneath them
+        executor.shutdown(wait=True, cancel_futures=True)
+        session.close()
     
     return False, None, None
 
@@ -136,9 +182,9 @@ def show_dhan_setup_guide():
     print("   • Ask specifically for 'API trading access'")
     print("   • Mention you need REST API credentials")
 
-def main():
+def _report():
     print("🚀 DHAN API CREDENTIAL VALIDATOR")
-    print(f"⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"⏰ {strftime('%Y-%m-%d %H:%M:%S', localtime())}")
     print()
     
     # Check credentials
@@ -170,5 +216,14 @@ def main():
         
         show_dhan_setup_guide()
 
+def main():
+    """Run the credential checks and print the report with a single buffered write"""
+    buf = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buf):
+            _report()
+    finally:
+        sys.stdout.write(buf.getvalue())
+
 if __name__ == "__main__":
     main()
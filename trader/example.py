@@ -4,8 +4,11 @@ Example configuration and usage script for the Nifty options trader
 
 import asyncio
 import os
+import time
 from datetime import datetime
 
+import anyio
+
 # Import trading components
 from src.api.dhan_client import DhanClient
 from src.data.data_manager import DataManager
@@ -15,13 +18,17 @@ from src.strategies.scalping import ScalpingStrategy
 from src.strategies.momentum import MomentumStrategy
 from src.data.database import DatabaseManager
 from src.utils.logger import setup_logger
+from src.utils.helpers import install_uvloop
 from dashboard.app import create_dashboard
 
+# Shared by every instance; setup_logger only needs to run once
+_LOG = setup_logger(__name__)
+
 class NiftyOptionsTrader:
     """Simple example of using the trading system"""
     
     def __init__(self):
-        self.logger = setup_logger(__name__)
+        self.logger = _LOG
         
         # Core components
         self.dhan_client = None
@@ -38,31 +45,34 @@ class NiftyOptionsTrader:
         
         # Control flags
         self.running = False
+        
+        # (monotonic time, status) of the last get_status() call
+        self._status_cache = (0.0, None)
     
     async def initialize(self):
         """Initialize all components"""
         try:
             self.logger.info("Initializing Nifty Options Trader...")
             
-            # Initialize database
+            # Open the database and authenticate with Dhan concurrently
             self.db_manager = DatabaseManager()
-            await self.db_manager.initialize()
-            
-            # Initialize API client
             self.dhan_client = DhanClient()
-            authenticated = await self.dhan_client.authenticate()
+            _, authenticated = await asyncio.gather(
+                self.db_manager.initialize(),
+                self.dhan_client.authenticate()
+            )
             
             if not authenticated:
                 self.logger.error("Failed to authenticate with Dhan. Please check your credentials.")
                 return False
             
-            # Initialize data manager
+            # Data and position managers only depend on the API client
             self.data_manager = DataManager(self.dhan_client)
-            await self.data_manager.initialize()
-            
-            # Initialize risk and order managers
             self.position_manager = PositionManager(self.dhan_client)
-            await self.position_manager.initialize()
+            await asyncio.gather(
+                self.data_manager.initialize(),
+                self.position_manager.initialize()
+            )
             
             self.order_manager = OrderManager(self.dhan_client, self.position_manager)
             
@@ -83,8 +93,7 @@ class NiftyOptionsTrader:
             }
             
             # Initialize strategies
-            for strategy in self.strategies.values():
-                await strategy.initialize()
+            await asyncio.gather(*(strategy.initialize() for strategy in self.strategies.values()))
             
             # Create dashboard
             self.dashboard = create_dashboard(self)
@@ -102,26 +111,22 @@ class NiftyOptionsTrader:
             return
         
         self.running = True
+        self._status_cache = (0.0, None)
         self.logger.info("Starting automated trading...")
         
         try:
-            # Start monitoring tasks
-            tasks = []
-            
-            # Start position monitoring
-            tasks.append(asyncio.create_task(self.position_manager.monitor_positions()))
-            
-            # Start order monitoring
-            tasks.append(asyncio.create_task(self.order_manager.monitor_orders()))
-            
-            # Start enabled strategies
-            for name, strategy in self.strategies.items():
-                if strategy.is_enabled():
-                    self.logger.info(f"Starting {name} strategy")
-                    tasks.append(asyncio.create_task(strategy.run()))
-            
-            # Run all tasks concurrently
-            await asyncio.gather(*tasks)
+            # Run every job in one task group: if any job fails the others
+            # are cancelled before the error is reported
+            async with anyio.create_task_group() as tg:
+                # Start position and order monitoring
+                tg.start_soon(self.position_manager.monitor_positions, name='position monitor')
+                tg.start_soon(self.order_manager.monitor_orders, name='order monitor')
+                
+                # Start enabled strategies
+                for name, strategy in self.strategies.items():
+                    if strategy.is_enabled():
+                        self.logger.info(f"Starting {name} strategy")
+                        tg.start_soon(strategy.run, name=f"{name} strategy")
             
         except Exception as e:
             self.logger.error(f"Error in trading loop: {e}")
@@ -132,23 +137,28 @@ class NiftyOptionsTrader:
         """Clean up resources"""
         try:
             self.logger.info("Cleaning up resources...")
+            self._status_cache = (0.0, None)
             
-            # Stop strategies
-            for strategy in self.strategies.values():
-                await strategy.stop()
-            
-            # Stop monitoring
-            await self.position_manager.stop_monitoring()
-            await self.order_manager.stop_monitoring()
-            
-            # Stop data feeds
-            await self.data_manager.stop_market_data_feed()
-            
-            # Close API client
-            await self.dhan_client.close()
-            
-            # Close database
-            await self.db_manager.close()
+            # Stop strategies; one failing must not skip the shutdown below
+            results = await asyncio.gather(
+                *(strategy.stop() for strategy in self.strategies.values()), return_exceptions=True
+            )
+            for name, result in zip(self.strategies, results):
+                if isinstance(result, Exception):
+                    self.logger.error(f"Error stopping {name} strategy: {result}")
+            
+            # Stop monitoring and data feeds, then close the API client and
+            # database; each group shuts down concurrently
+            for group in (
+                (self.position_manager.stop_monitoring(),
+                 self.order_manager.stop_monitoring(),
+                 self.data_manager.stop_market_data_feed()),
+                (self.dhan_client.close(),
+                 self.db_manager.close())
+            ):
+                for result in await asyncio.gather(*group, return_exceptions=True):
+                    if isinstance(result, Exception):
+                        self.logger.error(f"Error in cleanup: {result}")
             
             self.logger.info("Cleanup completed")
             
@@ -172,7 +182,13 @@ class NiftyOptionsTrader:
         if not self.position_manager or not self.data_manager:
             return {"status": "Not initialized"}
         
-        return {
+        # Bursts of dashboard polling share one status build per 250 ms
+        now = time.monotonic()
+        cached_at, status = self._status_cache
+        if status is not None and now - cached_at < 0.25:
+            return status
+        
+        status = {
             "status": "Running" if self.running else "Stopped",
             "market_open": self.data_manager.market_data.is_connected,
             "positions": len(self.position_manager.get_positions()),
@@ -184,6 +200,8 @@ class NiftyOptionsTrader:
                 for name, strategy in self.strategies.items()
             }
         }
+        self._status_cache = (now, status)
+        return status
 
 async def main():
     """Main function for running the trader"""
@@ -226,4 +244,5 @@ if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1] == "dashboard":
         run_dashboard_only()
     else:
+        install_uvloop()
         asyncio.run(main())
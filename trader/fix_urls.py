@@ -3,7 +3,54 @@
 Fixed URL construction script for dhan_client.py
 """
 
-import re
+import ast
+
+def _is_base_url(node):
+    """Check whether an expression is ``self.base_url``"""
+    return (isinstance(node, ast.Attribute) and node.attr == 'base_url'
+            and isinstance(node.value, ast.Name) and node.value.id == 'self')
+
+def _rewrite_urls(content):
+    """Rewrite urljoin(self.base_url, ...) calls as f-strings in one AST pass"""
+    source = content.encode()
+    
+    # AST column offsets are UTF-8 byte offsets within each line
+    line_starts = [0]
+    for line in source.splitlines(keepends=True):
+        line_starts.append(line_starts[-1] + len(line))
+    
+    def span(node):
+        return (line_starts[node.lineno - 1] + node.col_offset,
+                line_starts[node.end_lineno - 1] + node.end_col_offset)
+    
+    edits = []
+    for node in ast.walk(ast.parse(content)):
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+                and node.func.id == 'urljoin' and len(node.args) == 2
+                and not node.keywords and _is_base_url(node.args[0])):
+            start, end = span(node.args[1])
+            endpoint = source[start:end]
+            if isinstance(node.args[1], ast.JoinedStr):
+                # f"{...}/something" -> splice its body after the base URL
+                quote = endpoint[1:2]
+                replacement = b'f' + quote + b'{self.base_url}' + endpoint[2:]
+            else:
+                replacement = b'f"{self.base_url}{' + endpoint + b'}"'
+            edits.append((*span(node), replacement))
+        
+        # Remove the urljoin import since we don't need it anymore
+        elif (isinstance(node, ast.ImportFrom) and node.module == 'urllib.parse'
+                and [alias.name for alias in node.names] == ['urljoin']):
+            start, end = span(node)
+            if source[end:end + 1] == b'\n':
+                end += 1
+            edits.append((start, end, b''))
+    
+    # Apply edits back to front so earlier offsets stay valid
+    for start, end, replacement in sorted(edits, reverse=True):
+        source = source[:start] + replacement + source[end:]
+    
+    return source.decode()
 
 def fix_dhan_client():
     """Fix the URL construction in dhan_client.py"""
@@ -16,16 +63,7 @@ def fix_dhan_client():
         f.write(content)
     
     # Fix all the URL constructions
-    # Pattern 1: urljoin(self.base_url, self.endpoints['key'])
-    content = re.sub(r'urljoin\(self\.base_url,\s*self\.endpoints\[([^]]+)\]\)', 
-                     r'f"{self.base_url}{self.endpoints[\1]}"', content)
-    
-    # Pattern 2: urljoin(self.base_url, f"{self.endpoints['key']}/something")  
-    content = re.sub(r'urljoin\(self\.base_url,\s*f"{self\.endpoints\[([^]]+)\]}/([^"]+)"\)', 
-                     r'f"{self.base_url}{self.endpoints[\1]}/\2"', content)
-    
-    # Remove urljoin import since we don't need it anymore
-    content = re.sub(r'from urllib\.parse import urljoin\n', '', content)
+    content = _rewrite_urls(content)
     
     # Write the fixed version
     with open('src/api/dhan_client.py.fixed', 'w') as f:
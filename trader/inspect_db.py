@@ -25,39 +25,59 @@ def inspect_database():
     
     try:
         conn = sqlite3.connect(str(db_path))
+        # Read-path tuning: map pages into memory and keep temp data in RAM
+        for pragma in ("mmap_size=268435456", "cache_size=-65536", "temp_store=MEMORY"):
+            conn.execute(f"PRAGMA {pragma}")
         cursor = conn.cursor()
+        cursor.arraysize = 3  # sample rows shown per table
+        
+        # Read everything from one snapshot
+        conn.execute("BEGIN")
         
         # Get all tables
         cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-        tables = cursor.fetchall()
+        tables = [name for name, in cursor.fetchall()]
+        
+        # Columns of every table in one query
+        cursor.execute("""
+            SELECT m.name, p.name, p.type, p."notnull", p.dflt_value, p.pk
+            FROM sqlite_master AS m JOIN pragma_table_info(m.name) AS p
+            WHERE m.type='table' ORDER BY m.name, p.cid
+        """)
+        columns_by_table = {}
+        for table_name, *col in cursor.fetchall():
+            columns_by_table.setdefault(table_name, []).append(col)
+        
+        # Record counts for every table in one UNION ALL query; names come
+        # from sqlite_master, so quoting them is enough to keep this safe
+        counts = {}
+        if tables:
+            cursor.execute(" UNION ALL ".join(
+                f"SELECT ?, COUNT(*) FROM \"{table_name}\"" for table_name in tables
+            ), tables)
+            counts = dict(cursor.fetchall())
         
         print(f"📊 Found {len(tables)} tables:")
         print("-" * 30)
         
-        for table_name, in tables:
+        for table_name in tables:
             print(f"\n📋 Table: {table_name}")
             
-            # Get table info
-            cursor.execute(f"PRAGMA table_info({table_name})")
-            columns = cursor.fetchall()
-            
+            columns = columns_by_table.get(table_name, [])
             print(f"   Columns ({len(columns)}):")
-            for col in columns:
-                col_id, name, data_type, not_null, default, pk = col
+            for name, data_type, not_null, default, pk in columns:
                 pk_str = " (PRIMARY KEY)" if pk else ""
                 null_str = " NOT NULL" if not_null else ""
                 default_str = f" DEFAULT {default}" if default else ""
                 print(f"     - {name}: {data_type}{pk_str}{null_str}{default_str}")
             
-            # Count records
-            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-            count = cursor.fetchone()[0]
+            count = counts[table_name]
             print(f"   Records: {count}")
             
             # Show sample data if any
             if count > 0:
-                cursor.execute(f"SELECT * FROM {table_name} LIMIT 3")
-                rows = cursor.fetchall()
+                cursor.execute(f"SELECT * FROM \"{table_name}\" LIMIT 3")
+                rows = cursor.fetchmany()
                 col_names = [desc[0] for desc in cursor.description]
                 
                 print(f"   Sample data:")
@@ -70,6 +90,21 @@ def inspect_database():
                     print(f"       ... and {count - 3} more records")
         
         conn.close()
+        
+        # market_data above holds only ticks from before sharding; newer ones
+        # are in one market_YYYY-MM-DD.db file per day
+        shards = sorted(db_path.parent.glob('market_*.db'))
+        print(f"\n📋 Daily market data files: {len(shards)}")
+        for shard in shards:
+            shard_conn = sqlite3.connect(f"file:{shard}?mode=ro", uri=True)
+            try:
+                count = shard_conn.execute("SELECT COUNT(*) FROM market_data").fetchone()[0]
+                print(f"   {shard.name}: {count} records, {shard.stat().st_size:,} bytes")
+            except sqlite3.Error as e:
+                print(f"   {shard.name}: ❌ {e}")
+            finally:
+                shard_conn.close()
+        
         print("\n✅ Database inspection complete!")
         
     except Exception as e:
@@ -10,8 +10,11 @@ import sys
 from typing import Dict, Any
 import logging
 
+import anyio
+
 # Import core modules
 from src.utils.logger import setup_logger
+from src.utils.helpers import install_uvloop
 from src.api.dhan_client import DhanClient
 from src.strategies.scalping import ScalpingStrategy
 from src.strategies.momentum import MomentumStrategy
@@ -21,11 +24,14 @@ from src.data.data_manager import DataManager
 from src.data.database import DatabaseManager
 from config.settings import settings
 
+# Shared by every instance; setup_logger only needs to run once
+_LOG = setup_logger(__name__)
+
 class TradingBot:
     """Main trading bot orchestrator"""
     
     def __init__(self):
-        self.logger = setup_logger(__name__)
+        self.logger = _LOG
         self.running = False
         self.dhan_client = None
         self.data_manager = None
@@ -34,18 +40,22 @@ class TradingBot:
         self.strategies = {}
         self.db_manager = None
         
+        # Set to ask start_trading() to wind down
+        self.stop_requested = asyncio.Event()
+        
     async def initialize(self) -> bool:
         """Initialize all trading components"""
         try:
             self.logger.info("Initializing Nifty 50 Options Trading Bot...")
             
-            # Initialize database
+            # Open the database and authenticate with Dhan concurrently
             self.db_manager = DatabaseManager()
-            await self.db_manager.initialize()
-            
-            # Initialize Dhan API client
             self.dhan_client = DhanClient()
-            if not await self.dhan_client.authenticate():
+            _, authenticated = await asyncio.gather(
+                self.db_manager.initialize(),
+                self.dhan_client.authenticate()
+            )
+            if not authenticated:
                 self.logger.error("Failed to authenticate with Dhan API")
                 return False
             
@@ -88,60 +98,70 @@ class TradingBot:
             self.running = True
             self.logger.info("Starting automated trading...")
             
-            # Start all active strategies
-            tasks = []
-            for name, strategy in self.strategies.items():
-                if strategy.is_enabled():
-                    self.logger.info(f"Starting {name} strategy")
-                    tasks.append(asyncio.create_task(strategy.run()))
-            
-            # Start position monitoring
-            tasks.append(asyncio.create_task(self.position_manager.monitor_positions()))
-            
-            # Start order monitoring
-            tasks.append(asyncio.create_task(self.order_manager.monitor_orders()))
-            
-            # Wait for all tasks
-            try:
-                await asyncio.gather(*tasks)
-            except Exception as e:
-                self.logger.error(f"Error in trading tasks: {e}")
+            # Run every job in one task group: if any job fails the others
+            # are cancelled and the error propagates to the caller. The group
+            # body waits for a stop request and then cancels everything.
+            async with anyio.create_task_group() as tg:
+                for name, strategy in self.strategies.items():
+                    if strategy.is_enabled():
+                        self.logger.info(f"Starting {name} strategy")
+                        tg.start_soon(strategy.run, name=f"{name} strategy")
+                
+                # Start position and order monitoring
+                tg.start_soon(self.position_manager.monitor_positions, name='position monitor')
+                tg.start_soon(self.order_manager.monitor_orders, name='order monitor')
+                
+                await self.stop_requested.wait()
+                tg.cancel_scope.cancel()
     
     async def stop_trading(self):
         """Stop all trading activities"""
         self.logger.info("Stopping automated trading...")
         self.running = False
+        self.stop_requested.set()
         
-        # Stop all strategies
-        for strategy in self.strategies.values():
-            await strategy.stop()
+        # Stop all strategies; one failing must not skip the shutdown below
+        results = await asyncio.gather(
+            *(strategy.stop() for strategy in self.strategies.values()), return_exceptions=True
+        )
+        for name, result in zip(self.strategies, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"Error stopping {name} strategy: {result}")
         
         # Close all positions if configured to do so
         if hasattr(settings, 'close_positions_on_shutdown') and settings.close_positions_on_shutdown:
             await self.position_manager.close_all_positions()
         
-        # Stop data feeds
+        # Stop data feeds and close database connections concurrently
+        closers = []
         if self.data_manager:
-            await self.data_manager.stop_market_data_feed()
-        
-        # Close database connections
+            closers.append(self.data_manager.stop_market_data_feed())
         if self.db_manager:
-            await self.db_manager.close()
+            closers.append(self.db_manager.close())
+        for result in await asyncio.gather(*closers, return_exceptions=True):
+            if isinstance(result, Exception):
+                self.logger.error(f"Error stopping trading bot: {result}")
         
         self.logger.info("Trading bot stopped")
-    
-    def signal_handler(self, signum, frame):
-        """Handle shutdown signals"""
-        self.logger.info(f"Received signal {signum}, shutting down...")
-        asyncio.create_task(self.stop_trading())
 
 async def main():
     """Main application entry point"""
     bot = TradingBot()
     
-    # Set up signal handlers for graceful shutdown
-    signal.signal(signal.SIGINT, bot.signal_handler)
-    signal.signal(signal.SIGTERM, bot.signal_handler)
+    # Shutdown signals only request a stop; start_trading() then returns and
+    # the finally block below runs stop_trading() once
+    loop = asyncio.get_running_loop()
+    
+    def request_stop(signum):
+        bot.logger.info(f"Received signal {signum}, shutting down...")
+        bot.stop_requested.set()
+    
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, request_stop, signum)
+        except NotImplementedError:
+            # Windows event loops have no add_signal_handler
+            signal.signal(signum, lambda sig, frame: loop.call_soon_threadsafe(request_stop, sig))
     
     try:
         # Initialize the bot
@@ -163,6 +183,8 @@ if __name__ == "__main__":
     print("Press Ctrl+C to stop the bot")
     print("=" * 50)
     
+    install_uvloop()
+    
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
@@ -5,9 +5,41 @@ Interactive database query tool for the trading system
 
 import sqlite3
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from tabulate import tabulate
 
+def _connect(db_path):
+    """Open the query connection; called on the worker thread that will use it"""
+    conn = sqlite3.connect(str(db_path))
+    # Reject writes from ad-hoc SQL, map pages into memory and keep temp data in RAM
+    for pragma in ("query_only=ON", "mmap_size=268435456", "cache_size=-65536", "temp_store=MEMORY"):
+        conn.execute(f"PRAGMA {pragma}")
+    conn.row_factory = sqlite3.Row  # This allows accessing columns by name
+    
+    # New market data lives in one market_YYYY-MM-DD.db file per day; attach
+    # the most recent ones (as md_YYYYMMDD) so they can be queried too
+    shards = sorted(db_path.parent.glob('market_*.db'))
+    for shard in shards[-conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED):]:
+        alias = 'md_' + shard.stem[len('market_'):].replace('-', '')
+        conn.execute(f"ATTACH DATABASE ? AS {alias}", (str(shard),))
+    return conn
+
+def _shard_aliases(conn):
+    """Schema names of the attached daily market data files, oldest first"""
+    return [row['name'] for row in conn.execute("PRAGMA database_list") if row['name'].startswith('md_')]
+
+def _render(cursor, query):
+    """Run a query and format its result for display"""
+    cursor.execute(query)
+    results = cursor.fetchall()
+    
+    if results:
+        # Convert sqlite3.Row objects to dictionaries for better display
+        rows = [dict(row) for row in results]
+        return f"\n📊 Results ({len(results)} rows):\n" + tabulate(rows, headers="keys", tablefmt="grid")
+    return "\n📭 No results found."
+
 def query_database():
     """Interactive database query tool"""
     db_path = Path('data/trading_data.db')
@@ -16,15 +48,21 @@ def query_database():
         print("❌ Database file not found!")
         return
     
+    # All SQLite work and formatting runs on one worker thread that owns the
+    # connection, so quick queries can be prefetched while the user types
+    db = ThreadPoolExecutor(max_workers=1)
+    
     try:
-        conn = sqlite3.connect(str(db_path))
-        conn.row_factory = sqlite3.Row  # This allows accessing columns by name
-        cursor = conn.cursor()
+        conn = db.submit(_connect, db_path).result()
+        cursor = db.submit(conn.cursor).result()
+        shard_aliases = db.submit(_shard_aliases, conn).result()
         
         print("🔍 Interactive Trading Database Query Tool")
         print("=" * 50)
         print("Available tables: orders, trades, positions, market_data, daily_performance, strategy_performance, risk_events")
-        print("Type 'quit' to exit")
+        print("market_data holds only pre-shard ticks; newer ticks are in the daily files"
+              + (f" attached as md_YYYYMMDD, e.g. {shard_aliases[-1]}.market_data" if shard_aliases else " (none found)"))
+        print("Type 'quit' to exit, or 'r<number>' to re-run a quick query without its cache")
         print()
         
         # Some predefined useful queries
@@ -35,57 +73,88 @@ def query_database():
                     'orders' as table_name, COUNT(*) as count FROM orders
                 UNION ALL SELECT 'trades', COUNT(*) FROM trades
                 UNION ALL SELECT 'positions', COUNT(*) FROM positions  
-                UNION ALL SELECT 'market_data', COUNT(*) FROM market_data
+                UNION ALL SELECT 'market_data (pre-shard)', COUNT(*) FROM market_data
                 UNION ALL SELECT 'daily_performance', COUNT(*) FROM daily_performance
                 UNION ALL SELECT 'strategy_performance', COUNT(*) FROM strategy_performance
                 UNION ALL SELECT 'risk_events', COUNT(*) FROM risk_events
-            """),
+            """ + "".join(
+                f"UNION ALL SELECT '{alias}.market_data', COUNT(*) FROM {alias}.market_data\n"
+                for alias in shard_aliases
+            )),
             '3': ("Recent orders (if any)", "SELECT * FROM orders ORDER BY created_at DESC LIMIT 10"),
             '4': ("Recent trades (if any)", "SELECT * FROM trades ORDER BY executed_at DESC LIMIT 10"),
             '5': ("Current positions (if any)", "SELECT * FROM positions ORDER BY updated_at DESC"),
             '6': ("Today's performance (if any)", "SELECT * FROM daily_performance WHERE date = date('now')"),
         }
         
+        # Latest rendered result per quick query with the data_version of every
+        # schema it was rendered at; data_version changes whenever another
+        # connection commits (the file mtime does not: under WAL commits land
+        # in the -wal file). Queries on 'now' change with the clock alone, so
+        # they are never cached. Only touched on the worker thread.
+        cache = {}
+        schemas = ['main', *shard_aliases]
+        
+        def run_quick(query, refresh=False):
+            if "'now'" in query:
+                return _render(cursor, query)
+            versions = tuple(conn.execute(f"PRAGMA {schema}.data_version").fetchone()[0] for schema in schemas)
+            cached = cache.get(query)
+            if refresh or cached is None or cached[0] != versions:
+                cached = cache[query] = (versions, _render(cursor, query))
+            return cached[1]
+        
+        def prefetch():
+            for _, query in quick_queries.values():
+                try:
+                    run_quick(query)
+                except sqlite3.Error:
+                    pass  # reported when the user actually runs it
+        
+        # The menu never changes, so format it once
+        menu = "\n🚀 Quick Queries:\n" + "".join(
+            f"  {key}. {desc}\n" for key, (desc, _) in quick_queries.items()
+        ) + "  Or type your own SQL query:"
+        
+        # Warm the cache once while the user reads the menu; prefetching on
+        # every prompt would queue all of them ahead of the user's own query
+        db.submit(prefetch)
+        
         while True:
-            print("\n🚀 Quick Queries:")
-            for key, (desc, _) in quick_queries.items():
-                print(f"  {key}. {desc}")
-            print("  Or type your own SQL query:")
+            print(menu)
             
             user_input = input("\n> ").strip()
             
             if user_input.lower() in ['quit', 'exit', 'q']:
                 break
             
+            refresh = user_input[:1].lower() == 'r' and user_input[1:].strip() in quick_queries
+            if refresh:
+                user_input = user_input[1:].strip()
+            
             try:
                 # Check if it's a quick query
                 if user_input in quick_queries:
-                    query = quick_queries[user_input][1]
-                    print(f"\nExecuting: {quick_queries[user_input][0]}")
+                    desc, query = quick_queries[user_input]
+                    print(f"\nExecuting: {desc}")
+                    rendered = db.submit(run_quick, query, refresh)
                 else:
-                    query = user_input
-                
-                cursor.execute(query)
-                results = cursor.fetchall()
+                    rendered = db.submit(_render, cursor, user_input)
                 
-                if results:
-                    # Convert sqlite3.Row objects to dictionaries for better display
-                    rows = [dict(row) for row in results]
-                    print(f"\n📊 Results ({len(results)} rows):")
-                    print(tabulate(rows, headers="keys", tablefmt="grid"))
-                else:
-                    print("\n📭 No results found.")
+                print(rendered.result())
                     
             except sqlite3.Error as e:
                 print(f"❌ SQL Error: {e}")
             except Exception as e:
                 print(f"❌ Error: {e}")
         
-        conn.close()
+        db.submit(conn.close).result()
         print("\n👋 Goodbye!")
         
     except Exception as e:
         print(f"❌ Error connecting to database: {e}")
+    finally:
+        db.shutdown(cancel_futures=True)
 
 if __name__ == "__main__":
     # Check if tabulate is available, if not provide fallback
@@ -13,6 +13,10 @@ def check_environment():
     
     checks = []
     
+    # List the working directory once instead of stat-ing each path
+    with os.scandir('.') as entries:
+        present = {entry.name for entry in entries}
+    
     # Check Python version
     python_version = sys.version_info
     python_ok = python_version.major >= 3 and python_version.minor >= 8
@@ -20,18 +24,17 @@ def check_environment():
     
     # Check virtual environment
     venv_active = hasattr(sys, 'real_prefix') or (hasattr(sys, 'base_prefix') and sys.base_prefix != sys.prefix)
-    venv_exists = Path('.venv').exists()
+    venv_exists = '.venv' in present
     checks.append(("Virtual Environment", venv_active or venv_exists, "Active" if venv_active else "Available" if venv_exists else "Missing"))
     
     # Check directories
     required_dirs = ['src', 'config', 'logs', 'data']
     for directory in required_dirs:
-        exists = Path(directory).exists()
+        exists = directory in present
         checks.append((f"Directory {directory}", exists, "✓" if exists else "Missing"))
     
     # Check .env file
-    env_exists = Path('.env').exists()
-    env_example_exists = Path('.env.example').exists()
+    env_exists = '.env' in present
     checks.append(("Environment Config", env_exists, "Configured" if env_exists else "Needs setup"))
     
     # Print results
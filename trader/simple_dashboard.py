@@ -6,10 +6,13 @@ Simple dashboard launcher for the trading system
 import dash
 from dash import html, dcc
 import plotly.graph_objs as go
+import os
 import sqlite3
 import pandas as pd
 from datetime import datetime
 
+from src.utils.helpers import tail_lines
+
 # Initialize Dash app
 app = dash.Dash(__name__)
 
@@ -68,6 +71,12 @@ app.layout = html.Div([
         html.Div(id="recent-activity", style={'background-color': '#f8f9fa', 'padding': '20px', 'border-radius': '10px', 'font-family': 'monospace'}),
     ], style={'margin': '20px'}),
     
+    # Log file mtime the activity panel was last rendered from
+    dcc.Store(id='activity-mtime'),
+    
+    # Interval ticks that happened while the tab was visible
+    dcc.Store(id='visible-tick'),
+    
     # Auto-refresh component
     dcc.Interval(
         id='interval-component',
@@ -76,35 +85,60 @@ app.layout = html.Div([
     )
 ])
 
+LOG_FILE = "logs/trading_20250809.log"
+
 def get_recent_logs():
     """Get recent log entries"""
     try:
-        log_file = "logs/trading_20250809.log"
-        with open(log_file, 'r') as f:
-            lines = f.readlines()[-10:]  # Last 10 lines
+        # Read only the end of the file rather than the whole day's log
+        lines = tail_lines(LOG_FILE, 10)  # Last 10 lines
         
-        recent_logs = []
-        for line in lines:
-            if line.strip():
-                recent_logs.append(html.P(line.strip(), style={'margin': '2px', 'color': '#2c3e50'}))
+        recent_logs = [html.P(line.strip(), style={'margin': '2px', 'color': '#2c3e50'}) for line in lines]
         
         return recent_logs if recent_logs else [html.P("No recent activity", style={'color': '#7f8c8d'})]
     except:
         return [html.P("Unable to load log file", style={'color': '#e74c3c'})]
 
 @app.callback(
-    dash.dependencies.Output('recent-activity', 'children'),
+    [dash.dependencies.Output('recent-activity', 'children'),
+     dash.dependencies.Output('activity-mtime', 'data')],
+    [dash.dependencies.Input('visible-tick', 'data')],
+    [dash.dependencies.State('activity-mtime', 'data')]
+)
+def update_activity(n, last_mtime):
+    # Only re-read the log when it has been written since this client's last render
+    try:
+        mtime = os.stat(LOG_FILE).st_mtime_ns
+    except OSError:
+        mtime = None
+    if mtime is not None and mtime == last_mtime:
+        raise dash.exceptions.PreventUpdate
+    return get_recent_logs(), mtime
+
+# Hidden tabs stop asking the server for activity updates
+app.clientside_callback(
+    """
+    function(n) {
+        return document.hidden ? window.dash_clientside.no_update : n;
+    }
+    """,
+    dash.dependencies.Output('visible-tick', 'data'),
     [dash.dependencies.Input('interval-component', 'n_intervals')]
 )
-def update_activity(n):
-    return get_recent_logs()
 
-@app.callback(
+# The clock is formatted in the browser; the server is not involved
+app.clientside_callback(
+    """
+    function(n) {
+        var d = new Date();
+        var pad = function(x) { return String(x).padStart(2, '0'); };
+        return 'Last Updated: ' + d.getFullYear() + '-' + pad(d.getMonth() + 1) + '-' + pad(d.getDate()) +
+               ' ' + pad(d.getHours()) + ':' + pad(d.getMinutes()) + ':' + pad(d.getSeconds());
+    }
+    """,
     dash.dependencies.Output('status-time', 'children'),
     [dash.dependencies.Input('interval-component', 'n_intervals')]
 )
-def update_time(n):
-    return f"Last Updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
 
 if __name__ == '__main__':
     print("🚀 Starting Nifty Options Trading Dashboard...")
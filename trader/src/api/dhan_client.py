@@ -16,12 +16,21 @@ class DhanClient:
     
     def __init__(self):
         self.logger = TradingLogger(__name__)
+        self._log = self.logger.logger  # bound once for the hot paths
         self.base_url = DHAN_API_BASE_URL
         self.client_id = settings.dhan_client_id
         self.access_token = settings.dhan_access_token
         self.session = None
         self.authenticated = False
         
+        # Credentials do not change at runtime, so the headers are built once
+        self._headers = {
+            'Accept': 'application/json',
+            'Content-Type': 'application/json',
+            'clientid': self.client_id,
+            'accesstoken': self.access_token
+        }
+        
         # API endpoints
         self.endpoints = {
             'orders': '/v2/orders',
@@ -31,45 +40,51 @@ class DhanClient:
     
     async def initialize(self):
         """Initialize the client session"""
-        if not self.session:
-            self.session = aiohttp.ClientSession()
+        self._ensure_session()
         return await self.authenticate()
     
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        """Create the shared keep-alive session on first use"""
+        if not self.session:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=20,
+                    limit_per_host=10,
+                    keepalive_timeout=75,
+                    enable_cleanup_closed=True
+                ),
+                timeout=aiohttp.ClientTimeout(total=10),
+                headers=self._get_headers()
+            )
+        return self.session
+    
     async def close(self):
         """Close the client session"""
         if self.session:
             await self.session.close()
     
     def _get_headers(self) -> Dict[str, str]:
-        """Get headers for API requests"""
-        return {
-            'Accept': 'application/json',
-            'Content-Type': 'application/json',
-            'clientid': self.client_id,
-            'accesstoken': self.access_token
-        }
+        """Get headers for API requests (shared; do not mutate)"""
+        return self._headers
     
     async def authenticate(self) -> bool:
         """Authenticate with Dhan API"""
         try:
-            if not self.session:
-                self.session = aiohttp.ClientSession()
-            
-            headers = self._get_headers()
+            self._ensure_session()
             url = f"{self.base_url}{self.endpoints['funds']}"
             
-            async with self.session.get(url, headers=headers) as response:
+            async with self.session.get(url) as response:
                 if response.status == 200:
                     self.authenticated = True
-                    self.logger.logger.info("Dhan API authentication successful")
+                    self._log.info("Dhan API authentication successful")
                     return True
                 else:
                     error_msg = await response.text()
-                    self.logger.logger.error(f"Authentication failed: {error_msg}")
+                    self._log.error(f"Authentication failed: {error_msg}")
                     return False
                     
         except Exception as e:
-            self.logger.logger.error(f"Authentication error: {e}")
+            self._log.error(f"Authentication error: {e}")
             return False
     
     async def get_funds(self) -> Optional[Dict[str, Any]]:
@@ -78,20 +93,19 @@ class DhanClient:
             if not await self._ensure_authenticated():
                 return None
             
-            headers = self._get_headers()
             url = f"{self.base_url}{self.endpoints['funds']}"
             
-            async with self.session.get(url, headers=headers) as response:
+            async with self.session.get(url) as response:
                 if response.status == 200:
                     result = await response.json()
                     return result.get('data', {})
                 else:
                     error_msg = await response.text()
-                    self.logger.logger.error(f"Failed to get funds: {error_msg}")
+                    self._log.error(f"Failed to get funds: {error_msg}")
                     return None
                     
         except Exception as e:
-            self.logger.logger.error(f"Error getting funds: {e}")
+            self._log.error(f"Error getting funds: {e}")
             return None
     
     async def get_orders(self) -> Optional[List[Dict[str, Any]]]:
@@ -100,10 +114,9 @@ class DhanClient:
             if not await self._ensure_authenticated():
                 return []
             
-            headers = self._get_headers()
             url = f"{self.base_url}{self.endpoints['orders']}"
             
-            async with self.session.get(url, headers=headers) as response:
+            async with self.session.get(url) as response:
                 if response.status == 200:
                     content_type = response.headers.get('content-type', '')
                     if 'application/json' in content_type:
@@ -111,15 +124,15 @@ class DhanClient:
                         return result.get('data', [])
                     else:
                         # Handle HTML response (likely means no orders)
-                        self.logger.logger.debug("Orders endpoint returned HTML, likely no orders exist")
+                        self._log.debug("Orders endpoint returned HTML, likely no orders exist")
                         return []
                 else:
                     error_msg = await response.text()
-                    self.logger.logger.error(f"Failed to get orders: HTTP {response.status} - {error_msg}")
+                    self._log.error(f"Failed to get orders: HTTP {response.status} - {error_msg}")
                     return []
                     
         except Exception as e:
-            self.logger.logger.error(f"Error getting orders: {e}")
+            self._log.error(f"Error getting orders: {e}")
             return []
     
     async def get_positions(self) -> Optional[List[Dict[str, Any]]]:
@@ -128,10 +141,9 @@ class DhanClient:
             if not await self._ensure_authenticated():
                 return []
             
-            headers = self._get_headers()
             url = f"{self.base_url}{self.endpoints['positions']}"
             
-            async with self.session.get(url, headers=headers) as response:
+            async with self.session.get(url) as response:
                 if response.status == 200:
                     content_type = response.headers.get('content-type', '')
                     if 'application/json' in content_type:
@@ -139,15 +151,15 @@ class DhanClient:
                         return result.get('data', [])
                     else:
                         # Handle HTML response (likely means no positions)
-                        self.logger.logger.debug("Positions endpoint returned HTML, likely no positions exist")
+                        self._log.debug("Positions endpoint returned HTML, likely no positions exist")
                         return []
                 else:
                     error_msg = await response.text()
-                    self.logger.logger.error(f"Failed to get positions: HTTP {response.status} - {error_msg}")
+                    self._log.error(f"Failed to get positions: HTTP {response.status} - {error_msg}")
                     return []
                     
         except Exception as e:
-            self.logger.logger.error(f"Error getting positions: {e}")
+            self._log.error(f"Error getting positions: {e}")
             return []
     
     async def place_order(self, order_data: Dict[str, Any]) -> Optional[str]:
@@ -156,23 +168,22 @@ class DhanClient:
             if not await self._ensure_authenticated():
                 return None
             
-            headers = self._get_headers()
             url = f"{self.base_url}{self.endpoints['orders']}"
             
-            async with self.session.post(url, headers=headers, json=order_data) as response:
+            async with self.session.post(url, json=order_data) as response:
                 result = await response.json()
                 
                 if response.status == 200 and result.get('status') == 'success':
                     order_id = result.get('data', {}).get('orderId')
-                    self.logger.logger.info(f"Order placed successfully: {order_id}")
+                    self._log.info(f"Order placed successfully: {order_id}")
                     return order_id
                 else:
                     error_msg = result.get('message', 'Unknown error')
-                    self.logger.logger.error(f"Failed to place order: {error_msg}")
+                    self._log.error(f"Failed to place order: {error_msg}")
                     return None
                     
         except Exception as e:
-            self.logger.logger.error(f"Error placing order: {e}")
+            self._log.error(f"Error placing order: {e}")
             return None
     
     async def _ensure_authenticated(self) -> bool:
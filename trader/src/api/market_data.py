@@ -4,9 +4,11 @@ Real-time market data management for Nifty options
 
 import asyncio
 import json
+import random
+import numpy as np
 import websockets
-from typing import Dict, List, Optional, Callable, Any
-from datetime import datetime
+from typing import Dict, List, Optional, Callable, Any, Tuple
+import time
 import threading
 from collections import defaultdict
 
@@ -14,11 +16,76 @@ from src.utils.logger import TradingLogger
 from src.api.dhan_client import DhanClient
 from config.settings import DHAN_FEED_URL
 
+# Ticks are decoded on the hot path; use orjson when it is installed.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so error handling
+# is the same either way.
+try:
+    import orjson
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+else:
+    _json_loads = orjson.loads
+    
+    def _json_dumps(obj: Any) -> str:
+        # Subscription frames stay text frames, so hand websockets a str
+        return orjson.dumps(obj).decode()
+
+# Numeric tick fields kept per symbol. Prices have at most two decimals and
+# are stored as int32 hundredths (paise); quantities are stored as int64 and
+# price changes (absolute and percent) as float64, NaN when missing.
+_PRICE_FIELDS = ('ltp', 'bid', 'ask')
+_QTY_FIELDS = ('volume', 'oi')
+_CHANGE_FIELDS = ('change', 'change_percent')
+_LTP = _PRICE_FIELDS.index('ltp')
+_MISSING = np.iinfo(np.int32).min  # price not reported by the feed
+_MISSING_QTY = np.iinfo(np.int64).min  # quantity not reported by the feed
+_INT32_MAX = np.iinfo(np.int32).max
+_INT64_MAX = np.iinfo(np.int64).max
+_INITIAL_SYMBOLS = 64
+_MAX_PRICE_SYMBOLS = 512
+_MAX_PENDING_CALLBACKS = 1000
+
+# Pre-serialized single-symbol feed messages (mode is full, quote, or ltp).
+# Exchange symbols and segments are plain tickers, so no JSON escaping is needed.
+_SUBSCRIBE_MSG = '{"action":"subscribe","symbol":"%s","segment":"%s","mode":"full"}'
+_UNSUBSCRIBE_MSG = '{"action":"unsubscribe","symbol":"%s","segment":"%s"}'
+
+def _grow(array: np.ndarray, fill) -> np.ndarray:
+    """Double the symbol (last) axis of a column store, filling new slots"""
+    grown = np.full(array.shape[:-1] + (array.shape[-1] * 2,), fill, dtype=array.dtype)
+    grown[..., :array.shape[-1]] = array
+    return grown
+
+def _price_x100(value) -> int:
+    """Price in hundredths for the int32 store; _MISSING if absent, non-numeric, NaN or out of range"""
+    try:
+        x100 = round(float(value) * 100)
+    except (TypeError, ValueError, OverflowError):
+        return _MISSING
+    return x100 if _MISSING < x100 <= _INT32_MAX else _MISSING
+
+def _quantity(value) -> int:
+    """Quantity for the int64 store; _MISSING_QTY if absent, non-numeric or out of range"""
+    try:
+        quantity = int(value)
+    except (TypeError, ValueError, OverflowError):
+        return _MISSING_QTY
+    return quantity if _MISSING_QTY < quantity <= _INT64_MAX else _MISSING_QTY
+
+def _change(value) -> float:
+    """Price change for the float64 store; NaN if absent or non-numeric"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
 class MarketDataManager:
     """Manages real-time market data feeds"""
     
     def __init__(self, dhan_client: DhanClient):
         self.logger = TradingLogger(__name__)
+        self._log = self.logger.logger  # bound once for the hot paths
         self.dhan_client = dhan_client
         self.feed_url = DHAN_FEED_URL
         
@@ -30,16 +97,31 @@ class MarketDataManager:
         
         # Subscriptions and callbacks
         self.subscribed_symbols = set()
-        self.price_callbacks = defaultdict(list)
-        self.tick_callbacks = []
+        # Callbacks are split into sync and async once at registration so the
+        # tick path never has to inspect them
+        self._sync_price_callbacks = defaultdict(list)
+        self._async_price_callbacks = defaultdict(list)
+        self._sync_tick_callbacks = []
+        self._async_tick_callbacks = []
+        self._callback_tasks = set()  # strong refs to in-flight async callbacks
+        self._callbacks_saturated = False
         
         # Market data storage
-        self.latest_prices = {}
+        # Latest prices are stored column-wise: one row per field, one column
+        # per symbol, with a missing marker where the feed did not report a value
+        self._sym_idx = {}
+        self._symbols = []  # column -> symbol, None for freed columns
+        self._free_columns = []
+        self._prices_x100 = np.full((len(_PRICE_FIELDS), _INITIAL_SYMBOLS), _MISSING, dtype=np.int32)
+        self._quantities = np.full((len(_QTY_FIELDS), _INITIAL_SYMBOLS), _MISSING_QTY, dtype=np.int64)
+        self._changes = np.full((len(_CHANGE_FIELDS), _INITIAL_SYMBOLS), np.nan)
+        self._timestamps = np.zeros(_INITIAL_SYMBOLS, dtype=np.int64)
         self.option_chain_data = {}
         self.market_depth = {}
         
         # Control flags
         self.running = False
+        self._reader_task = None
     
     async def connect(self) -> bool:
         """
@@ -48,32 +130,46 @@ class MarketDataManager:
         Returns:
             True if connection successful
         """
+        if self.is_connected:
+            return True
+        
+        if not await self._open():
+            return False
+        
+        self.reconnect_attempts = 0
+        
+        # Start listening for messages; the reader reconnects on its own, so
+        # only one is ever running
+        if self._reader_task is None or self._reader_task.done():
+            self.running = True
+            self._reader_task = asyncio.create_task(self._message_handler())
+        
+        return True
+    
+    async def _open(self) -> bool:
+        """Open the WebSocket connection without starting the reader"""
         try:
-            if self.is_connected:
-                return True
-            
             headers = {
                 'clientid': self.dhan_client.client_id,
                 'accesstoken': self.dhan_client.access_token
             }
             
+            # Offer permessage-deflate; the server may decline it, in which
+            # case frames simply arrive uncompressed
             self.ws_connection = await websockets.connect(
                 self.feed_url,
                 ping_interval=30,
-                ping_timeout=10
+                ping_timeout=10,
+                compression='deflate',
+                max_size=2 ** 20
             )
             
             self.is_connected = True
-            self.reconnect_attempts = 0
-            self.logger.logger.info("Connected to market data feed")
-            
-            # Start listening for messages
-            asyncio.create_task(self._message_handler())
-            
+            self._log.info("Connected to market data feed")
             return True
             
         except Exception as e:
-            self.logger.logger.error(f"Failed to connect to market data feed: {e}")
+            self._log.error(f"Failed to connect to market data feed: {e}")
             self.is_connected = False
             return False
     
@@ -82,13 +178,17 @@ class MarketDataManager:
         try:
             self.running = False
             
+            # Stop a reader that is waiting out a reconnect backoff
+            if self._reader_task and not self._reader_task.done():
+                self._reader_task.cancel()
+            
             if self.ws_connection:
                 await self.ws_connection.close()
                 self.is_connected = False
-                self.logger.logger.info("Disconnected from market data feed")
+                self._log.info("Disconnected from market data feed")
             
         except Exception as e:
-            self.logger.logger.error(f"Error disconnecting from feed: {e}")
+            self._log.error(f"Error disconnecting from feed: {e}")
     
     async def subscribe_symbol(self, symbol: str, segment: str = "NSE_FNO") -> bool:
         """
@@ -106,21 +206,50 @@ class MarketDataManager:
                 if not await self.connect():
                     return False
             
+            await self.ws_connection.send(_SUBSCRIBE_MSG % (symbol, segment))
+            self.subscribed_symbols.add(f"{segment}:{symbol}")
+            
+            self._log.info(f"Subscribed to {symbol} ({segment})")
+            return True
+            
+        except Exception as e:
+            self._log.error(f"Failed to subscribe to {symbol}: {e}")
+            return False
+    
+    async def subscribe_symbols(self, instruments: List[Tuple[str, str]]) -> bool:
+        """
+        Subscribe to price updates for many symbols with one message
+        
+        Args:
+            instruments: (symbol, segment) pairs to subscribe
+            
+        Returns:
+            True if subscription successful
+        """
+        try:
+            if not instruments:
+                return True
+            
+            if not self.is_connected:
+                if not await self.connect():
+                    return False
+            
             subscription_msg = {
                 'action': 'subscribe',
-                'symbol': symbol,
-                'segment': segment,
-                'mode': 'full'  # full, quote, or ltp
+                'instruments': [
+                    {'symbol': symbol, 'segment': segment, 'mode': 'full'}
+                    for symbol, segment in instruments
+                ]
             }
             
-            await self.ws_connection.send(json.dumps(subscription_msg))
-            self.subscribed_symbols.add(f"{segment}:{symbol}")
+            await self.ws_connection.send(_json_dumps(subscription_msg))
+            self.subscribed_symbols.update(f"{segment}:{symbol}" for symbol, segment in instruments)
             
-            self.logger.logger.info(f"Subscribed to {symbol} ({segment})")
+            self._log.info(f"Subscribed to {len(instruments)} symbols")
             return True
             
         except Exception as e:
-            self.logger.logger.error(f"Failed to subscribe to {symbol}: {e}")
+            self._log.error(f"Failed to subscribe to {len(instruments)} symbols: {e}")
             return False
     
     async def unsubscribe_symbol(self, symbol: str, segment: str = "NSE_FNO") -> bool:
@@ -138,20 +267,15 @@ class MarketDataManager:
             if not self.is_connected:
                 return True
             
-            unsubscription_msg = {
-                'action': 'unsubscribe',
-                'symbol': symbol,
-                'segment': segment
-            }
-            
-            await self.ws_connection.send(json.dumps(unsubscription_msg))
+            await self.ws_connection.send(_UNSUBSCRIBE_MSG % (symbol, segment))
             self.subscribed_symbols.discard(f"{segment}:{symbol}")
+            self._drop_symbol(symbol)
             
-            self.logger.logger.info(f"Unsubscribed from {symbol} ({segment})")
+            self._log.info(f"Unsubscribed from {symbol} ({segment})")
             return True
             
         except Exception as e:
-            self.logger.logger.error(f"Failed to unsubscribe from {symbol}: {e}")
+            self._log.error(f"Failed to unsubscribe from {symbol}: {e}")
             return False
     
     def add_price_callback(self, symbol: str, callback: Callable):
@@ -162,7 +286,10 @@ class MarketDataManager:
             symbol: Trading symbol
             callback: Function to call on price update
         """
-        self.price_callbacks[symbol].append(callback)
+        if asyncio.iscoroutinefunction(callback):
+            self._async_price_callbacks[symbol].append(callback)
+        else:
+            self._sync_price_callbacks[symbol].append(callback)
     
     def add_tick_callback(self, callback: Callable):
         """
@@ -171,7 +298,10 @@ class MarketDataManager:
         Args:
             callback: Function to call on every tick
         """
-        self.tick_callbacks.append(callback)
+        if asyncio.iscoroutinefunction(callback):
+            self._async_tick_callbacks.append(callback)
+        else:
+            self._sync_tick_callbacks.append(callback)
     
     def get_latest_price(self, symbol: str) -> Optional[Dict[str, Any]]:
         """
@@ -183,7 +313,18 @@ class MarketDataManager:
         Returns:
             Latest price data or None if not available
         """
-        return self.latest_prices.get(symbol)
+        idx = self._sym_idx.get(symbol)
+        if idx is None:
+            return None
+        
+        price_data = {'symbol': symbol, 'timestamp': int(self._timestamps[idx])}
+        for field, value in zip(_PRICE_FIELDS, self._prices_x100[:, idx].tolist()):
+            price_data[field] = None if value == _MISSING else value / 100
+        for field, value in zip(_QTY_FIELDS, self._quantities[:, idx].tolist()):
+            price_data[field] = None if value == _MISSING_QTY else value
+        for field, value in zip(_CHANGE_FIELDS, self._changes[:, idx].tolist()):
+            price_data[field] = None if value != value else value
+        return price_data
     
     def get_ltp(self, symbol: str) -> Optional[float]:
         """
@@ -195,10 +336,11 @@ class MarketDataManager:
         Returns:
             Last traded price or None if not available
         """
-        price_data = self.latest_prices.get(symbol)
-        if price_data:
-            return price_data.get('ltp')
-        return None
+        idx = self._sym_idx.get(symbol)
+        if idx is None:
+            return None
+        ltp = int(self._prices_x100[_LTP, idx])
+        return None if ltp == _MISSING else ltp / 100
     
     async def get_option_chain(self, underlying: str = "NIFTY", 
                               expiry: str = None) -> Optional[Dict[str, Any]]:
@@ -220,11 +362,12 @@ class MarketDataManager:
             return None
             
         except Exception as e:
-            self.logger.logger.error(f"Error getting option chain: {e}")
+            self._log.error(f"Error getting option chain: {e}")
             return None
     
     async def subscribe_option_chain(self, underlying: str = "NIFTY",
-                                   expiry: str = None, strikes_range: int = 10):
+                                   expiry: str = None, strikes_range: int = 10
+                                   ) -> List[Tuple[float, Optional[str], Optional[str]]]:
         """
         Subscribe to option chain for real-time updates
         
@@ -232,75 +375,102 @@ class MarketDataManager:
             underlying: Underlying symbol
             expiry: Expiry date
             strikes_range: Number of strikes on each side of ATM
+            
+        Returns:
+            (strike, call_symbol, put_symbol) for every subscribed strike
         """
         try:
             # Get option chain first
             option_chain = await self.get_option_chain(underlying, expiry)
             if not option_chain:
-                return
+                return []
             
             # Get current spot price
             spot_quote = await self.dhan_client.get_market_quote(underlying, "NSE_EQ")
             if not spot_quote:
-                return
+                return []
             
             spot_price = spot_quote.get('ltp', 0)
             
-            # Subscribe to relevant strikes
-            subscribed_count = 0
-            for option in option_chain.get('options', []):
-                strike = option.get('strike_price', 0)
-                
-                # Only subscribe to strikes within range
-                if abs(strike - spot_price) <= strikes_range * 50:  # Nifty strikes are in multiples of 50
-                    # Subscribe to both call and put
-                    call_symbol = option.get('call_symbol')
-                    put_symbol = option.get('put_symbol')
-                    
-                    if call_symbol:
-                        await self.subscribe_symbol(call_symbol, "NSE_FNO")
-                        subscribed_count += 1
-                    
-                    if put_symbol:
-                        await self.subscribe_symbol(put_symbol, "NSE_FNO")
-                        subscribed_count += 1
-            
-            self.logger.logger.info(f"Subscribed to {subscribed_count} option symbols")
+            # Only subscribe to strikes within range; Nifty strikes are in multiples of 50
+            options = option_chain.get('options', [])
+            strikes = np.fromiter((option.get('strike_price', 0) for option in options),
+                                  dtype=np.float64, count=len(options))
+            in_range = np.flatnonzero(np.abs(strikes - spot_price) <= strikes_range * 50)
+            selected = [
+                (float(strikes[i]), options[i].get('call_symbol'), options[i].get('put_symbol'))
+                for i in in_range
+            ]
+            
+            # Subscribe to both call and put of every selected strike in one message
+            instruments = [
+                (symbol, "NSE_FNO")
+                for _, call_symbol, put_symbol in selected
+                for symbol in (call_symbol, put_symbol)
+                if symbol
+            ]
+            
+            if not await self.subscribe_symbols(instruments):
+                return []
+            
+            self._log.info(f"Subscribed to {len(instruments)} option symbols")
+            return selected
             
         except Exception as e:
-            self.logger.logger.error(f"Error subscribing to option chain: {e}")
+            self._log.error(f"Error subscribing to option chain: {e}")
+            return []
     
     async def _message_handler(self):
-        """Handle incoming WebSocket messages"""
-        self.running = True
-        
-        try:
-            async for message in self.ws_connection:
-                if not self.running:
-                    break
-                
-                try:
-                    data = json.loads(message)
-                    await self._process_tick_data(data)
+        """Read WebSocket messages, reconnecting with jittered backoff when the feed drops"""
+        while self.running:
+            try:
+                async for message in self.ws_connection:
+                    if not self.running:
+                        break
                     
-                except json.JSONDecodeError as e:
-                    self.logger.logger.error(f"Invalid JSON received: {e}")
-                except Exception as e:
-                    self.logger.logger.error(f"Error processing message: {e}")
+                    # The connection is healthy again once data flows
+                    if self.reconnect_attempts:
+                        self.reconnect_attempts = 0
                     
-        except websockets.exceptions.ConnectionClosed:
-            self.logger.logger.warning("WebSocket connection closed")
-            self.is_connected = False
+                    try:
+                        data = _json_loads(message)
+                        await self._process_tick_data(data)
+                        
+                    except json.JSONDecodeError as e:
+                        self._log.error(f"Invalid JSON received: {e}")
+                    except Exception as e:
+                        self._log.error(f"Error processing message: {e}")
+                
+            except websockets.exceptions.ConnectionClosed:
+                pass
+            except Exception as e:
+                self._log.error(f"Message handler error: {e}")
             
-            # Attempt to reconnect if still running
-            if self.running and self.reconnect_attempts < self.max_reconnect_attempts:
-                self.reconnect_attempts += 1
-                self.logger.logger.info(f"Attempting to reconnect ({self.reconnect_attempts}/{self.max_reconnect_attempts})")
-                await asyncio.sleep(2 ** self.reconnect_attempts)  # Exponential backoff
-                await self.connect()
+            self.is_connected = False
+            if not self.running:
+                break
+            self._log.warning("WebSocket connection closed")
+            
+            # Reconnect with capped, jittered exponential backoff
+            while self.running and not self.is_connected:
+                if self.reconnect_attempts >= self.max_reconnect_attempts:
+                    self._log.error("Giving up on market data feed after "
+                                    f"{self.reconnect_attempts} reconnect attempts")
+                    self.running = False
+                    return
                 
-        except Exception as e:
-            self.logger.logger.error(f"Message handler error: {e}")
+                self.reconnect_attempts += 1
+                delay = min(30, 2 ** self.reconnect_attempts) * (0.5 + random.random())
+                self._log.info(f"Attempting to reconnect ({self.reconnect_attempts}/{self.max_reconnect_attempts}) in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                if self.running:
+                    await self._open()
+            
+            # Restore the subscriptions the new connection does not know about
+            if self.running and self.subscribed_symbols:
+                await self.subscribe_symbols([
+                    tuple(reversed(key.split(':', 1))) for key in self.subscribed_symbols
+                ])
     
     async def _process_tick_data(self, data: Dict[str, Any]):
         """Process incoming tick data"""
@@ -317,41 +487,109 @@ class MarketDataManager:
                 'ask': data.get('ask'),
                 'volume': data.get('volume'),
                 'oi': data.get('oi'),  # Open Interest
-                'timestamp': datetime.now(),
+                'timestamp': time.time_ns(),  # epoch nanoseconds
                 'change': data.get('change'),
                 'change_percent': data.get('change_percent')
             }
             
-            self.latest_prices[symbol] = price_data
-            
-            # Call symbol-specific callbacks
-            for callback in self.price_callbacks.get(symbol, []):
-                try:
-                    if asyncio.iscoroutinefunction(callback):
-                        await callback(price_data)
-                    else:
-                        callback(price_data)
-                except Exception as e:
-                    self.logger.logger.error(f"Error in price callback: {e}")
-            
-            # Call general tick callbacks
-            for callback in self.tick_callbacks:
-                try:
-                    if asyncio.iscoroutinefunction(callback):
-                        await callback(price_data)
-                    else:
-                        callback(price_data)
-                except Exception as e:
-                    self.logger.logger.error(f"Error in tick callback: {e}")
+            idx = self._sym_idx.get(symbol)
+            if idx is None:
+                idx = self._add_symbol(symbol)
+            # A field the store cannot hold is kept as missing rather than
+            # raising, so the callbacks below still see the tick
+            self._prices_x100[:, idx] = [_price_x100(price_data[field]) for field in _PRICE_FIELDS]
+            self._quantities[:, idx] = [_quantity(price_data[field]) for field in _QTY_FIELDS]
+            self._changes[:, idx] = [_change(price_data[field]) for field in _CHANGE_FIELDS]
+            self._timestamps[idx] = price_data['timestamp']
+            
+            # Call symbol-specific callbacks, then general tick callbacks
+            self._call_sync(self._sync_price_callbacks.get(symbol, ()), price_data, "price")
+            self._call_sync(self._sync_tick_callbacks, price_data, "tick")
+            
+            # Async callbacks run as their own tasks so a slow one does not
+            # hold up the next tick
+            for callback in self._async_price_callbacks.get(symbol, ()):
+                self._spawn_callback(callback(price_data), "price")
+            for callback in self._async_tick_callbacks:
+                self._spawn_callback(callback(price_data), "tick")
                     
         except Exception as e:
-            self.logger.logger.error(f"Error processing tick data: {e}")
+            self._log.error(f"Error processing tick data: {e}")
+    
+    def _add_symbol(self, symbol: str) -> int:
+        """Assign a price column to a symbol, reusing freed columns first"""
+        if len(self._sym_idx) >= _MAX_PRICE_SYMBOLS:
+            # Evict the symbol that has gone longest without a tick
+            live = np.fromiter(self._sym_idx.values(), dtype=np.int64, count=len(self._sym_idx))
+            self._drop_symbol(self._symbols[live[np.argmin(self._timestamps[live])]])
+        
+        if self._free_columns:
+            idx = self._free_columns.pop()
+            self._symbols[idx] = symbol
+        else:
+            idx = len(self._symbols)
+            if idx == self._timestamps.shape[0]:
+                self._prices_x100 = _grow(self._prices_x100, _MISSING)
+                self._quantities = _grow(self._quantities, _MISSING_QTY)
+                self._changes = _grow(self._changes, np.nan)
+                self._timestamps = _grow(self._timestamps, 0)
+            self._symbols.append(symbol)
+        
+        self._sym_idx[symbol] = idx
+        return idx
+    
+    def _drop_symbol(self, symbol: str):
+        """Forget a symbol's latest price and free its column"""
+        idx = self._sym_idx.pop(symbol, None)
+        if idx is None:
+            return
+        self._prices_x100[:, idx] = _MISSING
+        self._quantities[:, idx] = _MISSING_QTY
+        self._changes[:, idx] = np.nan
+        self._timestamps[idx] = 0
+        self._symbols[idx] = None
+        self._free_columns.append(idx)
+    
+    def _call_sync(self, callbacks, price_data: Dict[str, Any], kind: str):
+        """Call sync callbacks in order with one try block around the loop"""
+        pending = iter(callbacks)
+        while True:
+            try:
+                for callback in pending:
+                    callback(price_data)
+                return
+            except Exception as e:
+                # Log and resume with the callbacks after the one that failed
+                name = getattr(callback, '__qualname__', callback)
+                self._log.error(f"Error in {kind} callback {name}: {e}")
+    
+    def _spawn_callback(self, coro, kind: str):
+        """Schedule an async callback, logging its error once it finishes"""
+        # Callbacks slower than the tick rate would otherwise pile up tasks
+        # without bound; drop new ones until the backlog drains
+        if len(self._callback_tasks) >= _MAX_PENDING_CALLBACKS:
+            coro.close()
+            if not self._callbacks_saturated:
+                self._callbacks_saturated = True
+                self._log.warning(f"{_MAX_PENDING_CALLBACKS} callbacks pending; dropping {kind} callbacks until they catch up")
+            return
+        self._callbacks_saturated = False
+        
+        task = asyncio.create_task(coro)
+        self._callback_tasks.add(task)
+        
+        def done(task):
+            self._callback_tasks.discard(task)
+            if not task.cancelled() and task.exception() is not None:
+                self._log.error(f"Error in {kind} callback: {task.exception()}")
+        
+        task.add_done_callback(done)
     
     def get_market_summary(self) -> Dict[str, Any]:
         """Get summary of current market data"""
         return {
             'connected': self.is_connected,
             'subscribed_symbols': len(self.subscribed_symbols),
-            'latest_prices_count': len(self.latest_prices),
+            'latest_prices_count': len(self._sym_idx),
             'reconnect_attempts': self.reconnect_attempts
         }
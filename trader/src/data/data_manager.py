@@ -3,21 +3,135 @@ Data manager for handling market data, storage, and analysis
 """
 
 import asyncio
-import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Any, Tuple
 from collections import deque
-import json
+import math
+import time
+
+try:
+    from numba import float64, njit
+except ImportError:  # Volatility falls back to the NumPy kernel
+    njit = None
 
 from src.utils.logger import TradingLogger
 from src.api.dhan_client import DhanClient
 from src.api.market_data import MarketDataManager
 from src.utils.helpers import get_nearest_strikes, get_expiry_dates
 
+# Number of Nifty ticks kept in memory
+_NIFTY_HISTORY = 1000
+
+# One Nifty tick; a missing LTP is NaN
+_TICK_DTYPE = np.dtype([('timestamp', 'M8[ns]'), ('ltp', 'f8'), ('volume', 'i8')])
+
+# Ticks between technical indicator updates
+_INDICATOR_INTERVAL = 10
+
+# SMA periods kept up to date with running sums on every tick
+_SMA_PERIODS = (5, 20)
+
+# One row per monitored strike; missing prices are NaN and missing counts -1.
+# Prices are float64 like the Nifty series (float32 would turn 123.45 into
+# 123.44999694824219); volume and OI are int64 to match the market data price store.
+_OPTION_DTYPE = np.dtype([
+    ('strike', 'f8'),
+    ('call_ltp', 'f8'), ('call_vol', 'i8'), ('call_oi', 'i8'),
+    ('put_ltp', 'f8'), ('put_vol', 'i8'), ('put_oi', 'i8'),
+])
+
+def _welford_volatility(prices):
+    """
+    Sample standard deviation of simple returns in one pass (Welford)
+    
+    Args:
+        prices: Contiguous float64 price array
+        
+    Returns:
+        Volatility, or NaN when there are fewer than two returns
+    """
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    for i in range(1, prices.shape[0]):
+        prev = prices[i - 1]
+        if prev > 0:
+            ret = (prices[i] - prev) / prev
+            count += 1
+            delta = ret - mean
+            mean += delta / count
+            m2 += delta * (ret - mean)
+    
+    if count < 2:
+        return math.nan
+    return math.sqrt(m2 / (count - 1))
+
+def _numpy_volatility(prices):
+    """Vectorised equivalent of _welford_volatility for when numba is missing"""
+    prev = prices[:-1]
+    valid = prev > 0
+    # One preallocated buffer, divided in place; masked only if a price is bad
+    returns = np.diff(prices)
+    np.divide(returns, prev, out=returns, where=valid)
+    if not valid.all():
+        returns = returns[valid]
+    if returns.size < 2:
+        return math.nan
+    return float(returns.std(ddof=1))
+
+if njit is not None:
+    # Eager C-contiguous signature so the kernel is compiled (or loaded from the
+    # on-disk cache) at import, then one warm-up call so the first tick pays
+    # no dispatch setup either
+    _vol_kernel = njit(float64(float64[::1]), cache=True, fastmath=True)(_welford_volatility)
+    _vol_kernel(np.ones(3))
+else:
+    _vol_kernel = _numpy_volatility
+
+# get_market_trend score -> trend
+_TREND_BY_SCORE = {2: 'bullish', -2: 'bearish'}
+
+# Stand-in for strikes that have no option row
+_EMPTY_OPTION_ROW = (None, math.nan, -1, -1, math.nan, -1, -1)
+
+def _option_side(ltp: float, volume: int, oi: int) -> Dict[str, Any]:
+    """Convert one side of an option row to an ltp/volume/oi dict"""
+    return {
+        'ltp': None if ltp != ltp else float(ltp),
+        'volume': None if volume < 0 else int(volume),
+        'oi': None if oi < 0 else int(oi)
+    }
+
+# Option ticks are written to option_data in batches, flushed every
+# _OPTION_FLUSH_INTERVAL seconds or as soon as _OPTION_BATCH_SIZE are queued
+_OPTION_FLUSH_INTERVAL = 0.02
+_OPTION_BATCH_SIZE = 256
+_PENDING_OPTION_DTYPE = np.dtype([
+    ('row', 'i8'), ('is_put', '?'), ('ltp', 'f8'), ('volume', 'i8'), ('oi', 'i8'),
+])
+
+def _nullable(column: np.ndarray) -> List[Any]:
+    """Convert an option_data column to a list with missing values as None"""
+    missing = np.isnan(column) if column.dtype.kind == 'f' else column < 0
+    values = column.astype(object)
+    values[missing] = None
+    return values.tolist()
+
 class DataManager:
     """Central data management system"""
     
+    # Fixed attribute layout; tick handlers touch these on every update
+    __slots__ = (
+        'logger', 'dhan_client', 'market_data',
+        'price_history', 'option_data', 'nifty_data',
+        '_strike_to_idx', '_option_symbols', '_pending_updates', '_option_flush_task', '_atm_band',
+        '_ltp_ring', '_ring_head', '_ring_count', '_ticks_seen', '_indicator_tick',
+        '_ltp_cumsum', '_gap_cumsum', '_cumsum_head',
+        '_sma_windows', '_sma_sums',
+        'history_length', 'current_expiry', 'monitored_strikes',
+        'technical_indicators', 'volatility_data',
+    )
+    
     def __init__(self, dhan_client: DhanClient):
         self.logger = TradingLogger(__name__)
         self.dhan_client = dhan_client
@@ -25,8 +139,31 @@ class DataManager:
         
         # Data storage
         self.price_history = {}  # Symbol -> deque of price data
-        self.option_data = {}    # Strike -> option data
-        self.nifty_data = deque(maxlen=1000)  # Last 1000 Nifty ticks
+        self.option_data = np.recarray(0, dtype=_OPTION_DTYPE)  # Row per monitored strike
+        self._strike_to_idx = {}  # Strike -> option_data row
+        self._option_symbols = {}  # Option symbol -> (option_data row, is_put)
+        self._pending_updates: List[Tuple[int, bool, float, int, int]] = []
+        self._option_flush_task = None
+        self._atm_band = (0.0, 0.0, None)  # (low, high, strike) the ATM strike holds for
+        
+        # Last 1000 Nifty ticks in a ring buffer; indicators read the LTP column
+        self.nifty_data = np.zeros(_NIFTY_HISTORY, dtype=_TICK_DTYPE)
+        self.nifty_data['ltp'] = np.nan
+        self._ltp_ring = self.nifty_data['ltp']  # view, not a copy
+        self._ring_head = 0  # next slot to write
+        self._ring_count = 0
+        self._ticks_seen = 0  # total Nifty ticks, unlike _ring_count never capped
+        self._indicator_tick = 0  # _ticks_seen at the last indicator update
+        
+        # Cumulative LTP sums and missing-price counts after each tick, one slot
+        # longer than the ring so a full-history window still has a start total
+        self._ltp_cumsum = np.zeros(_NIFTY_HISTORY + 1)
+        self._gap_cumsum = np.zeros(_NIFTY_HISTORY + 1, dtype=np.int64)
+        self._cumsum_head = 0  # slot of the latest totals
+        
+        # Trailing LTP windows and their running sums for the common SMAs
+        self._sma_windows = {period: deque(maxlen=period) for period in _SMA_PERIODS}
+        self._sma_sums = dict.fromkeys(_SMA_PERIODS, 0.0)
         
         # Configuration
         self.history_length = 500  # Number of ticks to keep
@@ -88,6 +225,10 @@ class DataManager:
     async def stop_market_data_feed(self):
         """Stop market data feed"""
         try:
+            if self._option_flush_task:
+                self._option_flush_task.cancel()
+                self._option_flush_task = None
+            
             await self.market_data.disconnect()
             self.logger.logger.info("Market data feed stopped")
             
@@ -101,9 +242,11 @@ class DataManager:
         Returns:
             Current Nifty price or None
         """
-        if self.nifty_data:
-            return self.nifty_data[-1].get('ltp')
-        return None
+        if not self._ring_count:
+            return None
+        
+        ltp = self._ltp_ring[self._ring_head - 1]
+        return None if np.isnan(ltp) else float(ltp)
     
     def get_nifty_data(self, count: int = 100) -> List[Dict[str, Any]]:
         """
@@ -115,10 +258,38 @@ class DataManager:
         Returns:
             List of price data
         """
-        if not self.nifty_data:
-            return []
+        # Only the requested rows are touched; columns convert straight to lists
+        ticks = self.get_nifty_array(count)
+        return [
+            {'ltp': None if ltp != ltp else ltp, 'volume': volume, 'timestamp': timestamp}
+            for timestamp, ltp, volume in zip(ticks['timestamp'].view(np.int64).tolist(),
+                                              ticks['ltp'].tolist(),
+                                              ticks['volume'].tolist())
+        ]
+    
+    def get_nifty_array(self, count: int = 100) -> np.recarray:
+        """
+        Get recent Nifty ticks as a record array
+        
+        Unless the window wraps around the ring this is a read-only view, so it
+        is only valid until the next ``count`` ticks overwrite it; copy it to keep it.
         
-        return list(self.nifty_data)[-count:]
+        Args:
+            count: Number of recent ticks to return
+            
+        Returns:
+            Records with timestamp, ltp (NaN when missing) and volume fields
+        """
+        count = min(count, self._ring_count)
+        start = self._ring_head - count
+        if start >= 0:
+            ticks = self.nifty_data[start:self._ring_head]
+        else:
+            ticks = np.concatenate((self.nifty_data[start:], self.nifty_data[:self._ring_head]))
+        
+        ticks = ticks.view(np.recarray)
+        ticks.flags.writeable = False
+        return ticks
     
     def get_option_price(self, symbol: str) -> Optional[float]:
         """
@@ -143,8 +314,38 @@ class DataManager:
         Returns:
             Option data or None
         """
-        key = f"{strike}_{option_type.upper()}"
-        return self.option_data.get(key)
+        idx = self._strike_to_idx.get(strike)
+        if idx is None:
+            return None
+        
+        side = option_type.lower()
+        row = self.option_data[idx]
+        if row[f'{side}_vol'] < 0:  # No tick received yet
+            return None
+        return _option_side(row[f'{side}_ltp'], row[f'{side}_vol'], row[f'{side}_oi'])
+    
+    def update_option_data(self, strike: float, option_type: str, price_data: Dict[str, Any]) -> bool:
+        """
+        Store the latest tick for a monitored option
+        
+        Args:
+            strike: Strike price
+            option_type: 'call' or 'put'
+            price_data: Tick with 'ltp', 'volume' and 'oi'
+            
+        Returns:
+            True if the strike is monitored
+        """
+        idx = self._strike_to_idx.get(strike)
+        if idx is None:
+            return False
+        
+        side = option_type.lower()
+        ltp = price_data.get('ltp')
+        self.option_data[f'{side}_ltp'][idx] = np.nan if ltp is None else ltp
+        self.option_data[f'{side}_vol'][idx] = price_data.get('volume') or 0
+        self.option_data[f'{side}_oi'][idx] = price_data.get('oi') or 0
+        return True
     
     def get_atm_options(self) -> Dict[str, Any]:
         """
@@ -157,8 +358,11 @@ class DataManager:
         if not nifty_price:
             return {}
         
-        # Find nearest strike
-        atm_strike = round(nifty_price / 50) * 50
+        # Nearest strike only changes once Nifty leaves its +/-25 point band
+        low, high, atm_strike = self._atm_band
+        if not low <= nifty_price < high:
+            atm_strike = round(nifty_price / 50) * 50
+            self._atm_band = (atm_strike - 25, atm_strike + 25, atm_strike)
         
         return {
             'strike': atm_strike,
@@ -186,25 +390,38 @@ class DataManager:
             'strikes': []
         }
         
+        # Monitored strikes are sorted, so the wanted rows are one contiguous slice
+        strike_col = self.option_data.strike
+        lo = np.searchsorted(strike_col, strikes[0])
+        hi = np.searchsorted(strike_col, strikes[-1], side='right')
+        rows = self.option_data[lo:hi]
+        
+        if len(rows) == len(strikes):
+            # Every wanted strike is monitored, so rows line up with strikes and
+            # whole columns can be converted at once
+            columns = [_nullable(rows[field]) for field in _OPTION_DTYPE.names[1:]]
+            chain_data['strikes'] = [
+                {
+                    'strike': strike,
+                    'call': {'ltp': call_ltp, 'volume': call_vol, 'oi': call_oi},
+                    'put': {'ltp': put_ltp, 'volume': put_vol, 'oi': put_oi}
+                }
+                for strike, call_ltp, call_vol, call_oi, put_ltp, put_vol, put_oi
+                in zip(strikes, *columns)
+            ]
+            return chain_data
+        
+        # Price has drifted past the monitored strikes; fill the gaps per strike
+        rows = {row[0]: row for row in rows.tolist()}
         for strike in strikes:
-            call_data = self.get_option_data(strike, 'call')
-            put_data = self.get_option_data(strike, 'put')
+            _, call_ltp, call_vol, call_oi, put_ltp, put_vol, put_oi = rows.get(
+                strike, _EMPTY_OPTION_ROW)
             
-            strike_info = {
+            chain_data['strikes'].append({
                 'strike': strike,
-                'call': {
-                    'ltp': call_data.get('ltp') if call_data else None,
-                    'volume': call_data.get('volume') if call_data else None,
-                    'oi': call_data.get('oi') if call_data else None
-                },
-                'put': {
-                    'ltp': put_data.get('ltp') if put_data else None,
-                    'volume': put_data.get('volume') if put_data else None,
-                    'oi': put_data.get('oi') if put_data else None
-                }
-            }
-            
-            chain_data['strikes'].append(strike_info)
+                'call': _option_side(call_ltp, call_vol, call_oi),
+                'put': _option_side(put_ltp, put_vol, put_oi)
+            })
         
         return chain_data
     
@@ -218,14 +435,29 @@ class DataManager:
         Returns:
             SMA value or None
         """
-        if len(self.nifty_data) < period:
+        window = self._sma_windows.get(period)
+        if window is not None:
+            if len(window) < period:
+                return None
+            return self._sma_sums[period] / period
+        
+        if self._ring_count < period:
             return None
         
-        prices = [tick['ltp'] for tick in list(self.nifty_data)[-period:] if tick.get('ltp')]
-        if len(prices) < period:
+        # Any window is the difference of two cumulative totals
+        end = self._cumsum_head
+        if self._gap_cumsum[end] != self._gap_cumsum[end - period]:
             return None
         
-        return sum(prices) / len(prices)
+        return float(self._ltp_cumsum[end] - self._ltp_cumsum[end - period]) / period
+    
+    def _recent_ltps(self, count: int) -> np.ndarray:
+        """Return the last ``count`` Nifty LTPs in tick order"""
+        start = self._ring_head - count
+        if start >= 0:
+            return self._ltp_ring[start:self._ring_head]
+        # The window wraps around the end of the buffer
+        return np.concatenate((self._ltp_ring[start:], self._ltp_ring[:self._ring_head]))
     
     def calculate_price_change(self, period: int = 10) -> Optional[float]:
         """
@@ -237,16 +469,17 @@ class DataManager:
         Returns:
             Price change or None
         """
-        if len(self.nifty_data) < period + 1:
+        if self._ring_count < period + 1:
             return None
         
-        current_price = self.nifty_data[-1].get('ltp')
-        past_price = self.nifty_data[-period-1].get('ltp')
+        # Negative indices wrap around the ring for free
+        current_price = self._ltp_ring[self._ring_head - 1]
+        past_price = self._ltp_ring[self._ring_head - period - 1]
         
-        if current_price and past_price:
-            return current_price - past_price
+        if np.isnan(current_price) or np.isnan(past_price):
+            return None
         
-        return None
+        return float(current_price - past_price)
     
     def calculate_volatility(self, period: int = 20) -> Optional[float]:
         """
@@ -258,52 +491,60 @@ class DataManager:
         Returns:
             Volatility value or None
         """
-        if len(self.nifty_data) < period + 1:
+        if self._ring_count < period + 1:
             return None
         
-        prices = [tick['ltp'] for tick in list(self.nifty_data)[-period:] if tick.get('ltp')]
-        if len(prices) < period:
+        return self._volatility_of(self._recent_ltps(period))
+    
+    @staticmethod
+    def _volatility_of(prices: np.ndarray) -> Optional[float]:
+        """Volatility of a price array, or None if a price is missing or it is too short"""
+        if np.isnan(prices).any():
             return None
         
-        # Calculate returns
-        returns = []
-        for i in range(1, len(prices)):
-            if prices[i-1] > 0:
-                returns.append((prices[i] - prices[i-1]) / prices[i-1])
-        
-        if len(returns) < 2:
+        volatility = _vol_kernel(np.ascontiguousarray(prices))
+        if math.isnan(volatility):
             return None
         
-        # Calculate standard deviation of returns
-        mean_return = sum(returns) / len(returns)
-        variance = sum((r - mean_return) ** 2 for r in returns) / (len(returns) - 1)
-        
-        return variance ** 0.5
+        return float(volatility)
     
-    def get_market_trend(self) -> str:
+    def get_market_trend(self, sma_short: Optional[float] = None, sma_long: Optional[float] = None,
+                         price_change: Optional[float] = None) -> str:
         """
         Determine current market trend
         
+        Args:
+            sma_short: Precomputed 5 tick SMA
+            sma_long: Precomputed 20 tick SMA
+            price_change: Precomputed 10 tick price change
+        
         Returns:
             'bullish', 'bearish', or 'neutral'
         """
-        if len(self.nifty_data) < 20:
+        if self._ring_count < 20:
             return 'neutral'
         
-        sma_short = self.calculate_simple_moving_average(5)
-        sma_long = self.calculate_simple_moving_average(20)
-        price_change = self.calculate_price_change(10)
+        if sma_short is None:
+            sma_short = self.calculate_simple_moving_average(5)
+        if sma_long is None:
+            sma_long = self.calculate_simple_moving_average(20)
+        if price_change is None:
+            price_change = self.calculate_price_change(10)
         
+        return self._trend_from(sma_short, sma_long, price_change)
+    
+    @staticmethod
+    def _trend_from(sma_short: Optional[float], sma_long: Optional[float],
+                    price_change: Optional[float]) -> str:
+        """Trend for the given indicator values; 'neutral' if any is missing"""
         if not sma_short or not sma_long or price_change is None:
             return 'neutral'
         
-        # Determine trend based on moving averages and price change
-        if sma_short > sma_long and price_change > 0:
-            return 'bullish'
-        elif sma_short < sma_long and price_change < 0:
-            return 'bearish'
-        else:
-            return 'neutral'
+        # Sign of the SMA spread plus sign of the price change; only agreement
+        # in both (+2 or -2) makes a trend
+        score = ((sma_short > sma_long) - (sma_short < sma_long)
+                 + (price_change > 0) - (price_change < 0))
+        return _TREND_BY_SCORE.get(score, 'neutral')
     
     async def _setup_option_monitoring(self):
         """Setup option chain monitoring"""
@@ -321,8 +562,28 @@ class DataManager:
             
             self.monitored_strikes = strikes
             
-            # Subscribe to option chain
-            await self.market_data.subscribe_option_chain("NIFTY", self.current_expiry, 10)
+            # Preallocate one option row per strike
+            self.option_data = np.recarray(len(strikes), dtype=_OPTION_DTYPE)
+            self.option_data.strike = strikes
+            for side in ('call', 'put'):
+                self.option_data[f'{side}_ltp'] = np.nan
+                self.option_data[f'{side}_vol'] = -1
+                self.option_data[f'{side}_oi'] = -1
+            self._strike_to_idx = {strike: i for i, strike in enumerate(strikes)}
+            
+            # Subscribe to option chain and route its ticks to the option rows
+            subscribed = await self.market_data.subscribe_option_chain("NIFTY", self.current_expiry, 10)
+            for strike, call_symbol, put_symbol in subscribed:
+                row = self._strike_to_idx.get(strike)
+                if row is None:
+                    continue
+                for symbol, is_put in ((call_symbol, False), (put_symbol, True)):
+                    if symbol:
+                        self._option_symbols[symbol] = (row, is_put)
+                        self.market_data.add_price_callback(symbol, self._on_option_tick)
+            
+            if self._option_symbols and self._option_flush_task is None:
+                self._option_flush_task = asyncio.create_task(self._flush_option_updates_periodically())
             
         except Exception as e:
             self.logger.logger.error(f"Error setting up option monitoring: {e}")
@@ -330,24 +591,115 @@ class DataManager:
     async def _on_nifty_tick(self, price_data: Dict[str, Any]):
         """Handle Nifty price updates"""
         try:
-            self.nifty_data.append(price_data)
+            ltp = price_data.get('ltp')
+            self.nifty_data[self._ring_head] = (
+                price_data.get('timestamp') or time.time_ns(),
+                ltp if ltp else np.nan,
+                price_data.get('volume') or 0
+            )
+            self._ring_head = (self._ring_head + 1) % _NIFTY_HISTORY
+            self._ring_count = min(self._ring_count + 1, _NIFTY_HISTORY)
+            self._ticks_seen += 1
+            self._update_cumsums(ltp)
+            self._update_sma_sums(ltp)
             
             # Update technical indicators periodically
-            if len(self.nifty_data) % 10 == 0:  # Every 10 ticks
+            if self._ticks_seen - self._indicator_tick >= _INDICATOR_INTERVAL:
                 self._update_technical_indicators()
                 
         except Exception as e:
             self.logger.logger.error(f"Error processing Nifty tick: {e}")
     
+    def _on_option_tick(self, price_data: Dict[str, Any]):
+        """Queue an option tick for the next batched write"""
+        target = self._option_symbols.get(price_data.get('symbol'))
+        if target is None:
+            return
+        
+        ltp = price_data.get('ltp')
+        self._pending_updates.append((
+            *target,
+            np.nan if ltp is None else ltp,
+            price_data.get('volume') or 0,
+            price_data.get('oi') or 0
+        ))
+        if len(self._pending_updates) >= _OPTION_BATCH_SIZE:
+            self._flush_option_updates()
+    
+    def _flush_option_updates(self):
+        """Write all queued option ticks into option_data at once"""
+        pending, self._pending_updates = self._pending_updates, []
+        if not pending:
+            return
+        
+        # Later ticks for the same row win, as with one-at-a-time writes
+        updates = np.array(pending, dtype=_PENDING_OPTION_DTYPE)
+        for side, mask in (('call', ~updates['is_put']), ('put', updates['is_put'])):
+            rows = updates['row'][mask]
+            self.option_data[f'{side}_ltp'][rows] = updates['ltp'][mask]
+            self.option_data[f'{side}_vol'][rows] = updates['volume'][mask]
+            self.option_data[f'{side}_oi'][rows] = updates['oi'][mask]
+    
+    async def _flush_option_updates_periodically(self):
+        """Flush queued option ticks every _OPTION_FLUSH_INTERVAL seconds"""
+        while True:
+            await asyncio.sleep(_OPTION_FLUSH_INTERVAL)
+            try:
+                self._flush_option_updates()
+            except Exception as e:
+                self.logger.logger.error(f"Error writing option updates: {e}")
+    
+    def _update_cumsums(self, ltp: Optional[float]):
+        """Append the running LTP and missing-price totals for one tick"""
+        prev = self._cumsum_head
+        head = (prev + 1) % (_NIFTY_HISTORY + 1)
+        self._ltp_cumsum[head] = self._ltp_cumsum[prev] + (ltp or 0.0)
+        self._gap_cumsum[head] = self._gap_cumsum[prev] + (not ltp)
+        self._cumsum_head = head
+        
+        if head == 0:
+            # Rebase once per lap so the totals stay small and precise
+            self._ltp_cumsum -= self._ltp_cumsum[head]
+            self._gap_cumsum -= self._gap_cumsum[head]
+    
+    def _update_sma_sums(self, ltp: Optional[float]):
+        """Slide the SMA windows forward by one tick"""
+        if not ltp:
+            # A tick without a price invalidates every window that would contain it
+            for period, window in self._sma_windows.items():
+                window.clear()
+                self._sma_sums[period] = 0.0
+            return
+        
+        for period, window in self._sma_windows.items():
+            if len(window) == period:
+                self._sma_sums[period] -= window[0]
+            window.append(ltp)
+            self._sma_sums[period] += ltp
+        
+        # Re-sum exactly once per lap of the ring so rounding error can't build up
+        if self._ring_head == 0:
+            for period, window in self._sma_windows.items():
+                self._sma_sums[period] = math.fsum(window)
+    
     def _update_technical_indicators(self):
         """Update technical indicators"""
+        # Nothing to do until a tick arrives after the last update
+        if self._ticks_seen == self._indicator_tick:
+            return
+        self._indicator_tick = self._ticks_seen
+        
         try:
+            sma_5 = self.calculate_simple_moving_average(5)
+            sma_20 = self.calculate_simple_moving_average(20)
+            price_change_10 = self.calculate_price_change(10)
+            
             self.technical_indicators.update({
-                'sma_5': self.calculate_simple_moving_average(5),
-                'sma_20': self.calculate_simple_moving_average(20),
-                'price_change_10': self.calculate_price_change(10),
+                'sma_5': sma_5,
+                'sma_20': sma_20,
+                'price_change_10': price_change_10,
                 'volatility_20': self.calculate_volatility(20),
-                'trend': self.get_market_trend()
+                'trend': self._trend_from(sma_5, sma_20, price_change_10)
             })
             
         except Exception as e:
@@ -360,7 +712,7 @@ class DataManager:
     def get_data_summary(self) -> Dict[str, Any]:
         """Get summary of current data state"""
         return {
-            'nifty_ticks': len(self.nifty_data),
+            'nifty_ticks': self._ring_count,
             'nifty_price': self.get_nifty_price(),
             'monitored_strikes': len(self.monitored_strikes),
             'current_expiry': self.current_expiry,
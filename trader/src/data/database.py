@@ -5,21 +5,593 @@ Database manager for storing trading data, orders, and performance metrics
 import asyncio
 import sqlite3
 import json
-from typing import Dict, List, Optional, Any
-from datetime import datetime, date
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Union
+from datetime import datetime, date, timedelta, timezone
 from pathlib import Path
 import logging
 
 from src.utils.logger import TradingLogger
 
+# Metadata is encoded on every write and decoded on every read; use orjson
+# when it is installed. JSON metadata is stored as TEXT, so the encoder returns str.
+try:
+    import orjson
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+else:
+    _json_loads = orjson.loads
+    
+    def _json_dumps(obj: Any) -> str:
+        # Non-str keys are stringified like json.dumps does
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode()
+
+# New metadata is written as MessagePack BLOBs when msgspec is installed,
+# which is smaller and faster than JSON text. Rows written before that (or
+# without msgspec) hold JSON TEXT; readers tell them apart by type.
+try:
+    import msgspec
+except ImportError:
+    _encode_metadata = _json_dumps
+    
+    def _decode_msgpack(raw: bytes) -> Any:
+        raise RuntimeError("Metadata is stored as MessagePack; install msgspec to read it")
+else:
+    def _msgpack_default(obj: Any) -> Any:
+        # NumPy scalars and arrays, as OPT_SERIALIZE_NUMPY allows for JSON
+        if hasattr(obj, 'tolist'):
+            return obj.tolist()
+        raise NotImplementedError(f"Cannot encode {type(obj).__name__} metadata")
+    
+    _encode_metadata = msgspec.msgpack.Encoder(enc_hook=_msgpack_default).encode
+    _decode_msgpack = msgspec.msgpack.Decoder().decode
+
+def _decode_metadata(raw: Any) -> Any:
+    """Decode a metadata column value written as MessagePack or JSON"""
+    if isinstance(raw, bytes):
+        return _decode_msgpack(raw)
+    return _json_loads(raw)
+
+def _metadata_param(metadata: Any) -> Any:
+    """Metadata column value, or NULL when there is none to encode"""
+    return _encode_metadata(metadata) if metadata else None
+
+def _utc_now() -> str:
+    """
+    Current UTC time for timestamp columns, formatted like CURRENT_TIMESTAMP
+    (so old and new rows sort together) but with microseconds
+    """
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S.%f')
+
+# Most writes committed in one transaction by the writer task
+_WRITE_BATCH_SIZE = 200
+
+# Seconds between PRAGMA optimize runs while writes keep coming in
+_OPTIMIZE_INTERVAL = 3600.0
+
+# Past days' PnL rows no longer change, so recent lookups are kept in memory
+_PNL_CACHE_SIZE = 32
+
+# The whole schema is created in one transaction, so a crash mid-way
+# never leaves a partially initialized database
+_SCHEMA_SQL = """
+    BEGIN;
+
+    -- Orders table
+    CREATE TABLE IF NOT EXISTS orders (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        order_id TEXT UNIQUE,
+        symbol TEXT NOT NULL,
+        side TEXT NOT NULL,  -- BUY/SELL
+        order_type TEXT NOT NULL,  -- MARKET/LIMIT
+        quantity INTEGER NOT NULL,
+        price REAL,
+        status TEXT NOT NULL,  -- PENDING/OPEN/FILLED/CANCELLED
+        strategy TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        filled_price REAL,
+        filled_quantity INTEGER DEFAULT 0,
+        metadata BLOB  -- MessagePack (JSON text in older rows)
+    );
+
+    -- Trades table
+    CREATE TABLE IF NOT EXISTS trades (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        trade_id TEXT UNIQUE,
+        symbol TEXT NOT NULL,
+        side TEXT NOT NULL,
+        quantity INTEGER NOT NULL,
+        price REAL NOT NULL,
+        value REAL NOT NULL,
+        strategy TEXT,
+        pnl REAL DEFAULT 0,
+        commission REAL DEFAULT 0,
+        executed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        order_id TEXT,
+        metadata BLOB,
+        FOREIGN KEY (order_id) REFERENCES orders (order_id)
+    );
+
+    -- Positions table
+    CREATE TABLE IF NOT EXISTS positions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        symbol TEXT UNIQUE,
+        quantity INTEGER NOT NULL,
+        avg_price REAL NOT NULL,
+        market_price REAL,
+        pnl REAL DEFAULT 0,
+        unrealized_pnl REAL DEFAULT 0,
+        strategy TEXT,
+        opened_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        metadata BLOB
+    );
+
+    -- Market data from before the daily shard files (see _attach_market_day)
+    CREATE TABLE IF NOT EXISTS market_data (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        symbol TEXT NOT NULL,
+        price REAL NOT NULL,
+        volume INTEGER,
+        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        bid REAL,
+        ask REAL,
+        open_interest INTEGER,
+        metadata BLOB
+    );
+
+    -- Daily performance table
+    CREATE TABLE IF NOT EXISTS daily_performance (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date DATE UNIQUE,
+        total_pnl REAL DEFAULT 0,
+        realized_pnl REAL DEFAULT 0,
+        unrealized_pnl REAL DEFAULT 0,
+        trades_count INTEGER DEFAULT 0,
+        winning_trades INTEGER DEFAULT 0,
+        losing_trades INTEGER DEFAULT 0,
+        max_drawdown REAL DEFAULT 0,
+        portfolio_value REAL DEFAULT 0,
+        metadata BLOB
+    );
+
+    -- Strategy performance table
+    CREATE TABLE IF NOT EXISTS strategy_performance (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        strategy_name TEXT NOT NULL,
+        date DATE,
+        pnl REAL DEFAULT 0,
+        trades_count INTEGER DEFAULT 0,
+        win_rate REAL DEFAULT 0,
+        avg_win REAL DEFAULT 0,
+        avg_loss REAL DEFAULT 0,
+        max_drawdown REAL DEFAULT 0,
+        sharpe_ratio REAL DEFAULT 0,
+        metadata BLOB,
+        UNIQUE(strategy_name, date)
+    );
+
+    -- Risk events table
+    CREATE TABLE IF NOT EXISTS risk_events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        event_type TEXT NOT NULL,  -- POSITION_LIMIT/LOSS_LIMIT/VOLATILITY etc.
+        symbol TEXT,
+        description TEXT,
+        severity TEXT,  -- LOW/MEDIUM/HIGH/CRITICAL
+        action_taken TEXT,
+        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        metadata BLOB
+    );
+
+    -- Indexes matching the getters' and cleanup's predicates
+    -- (daily_performance.date is already indexed by its UNIQUE constraint)
+    CREATE INDEX IF NOT EXISTS idx_orders_status_created ON orders(status, created_at DESC);
+    CREATE INDEX IF NOT EXISTS idx_orders_created ON orders(created_at DESC);
+    CREATE INDEX IF NOT EXISTS idx_trades_symbol_time ON trades(symbol, executed_at DESC);
+    CREATE INDEX IF NOT EXISTS idx_market_data_ts ON market_data(timestamp);
+    CREATE INDEX IF NOT EXISTS idx_market_data_symbol_ts ON market_data(symbol, timestamp DESC);
+    CREATE INDEX IF NOT EXISTS idx_risk_events_ts ON risk_events(timestamp);
+
+    COMMIT;
+"""
+
+# Write statements are module constants so each one always reaches the
+# connection's prepared statement cache under the same text
+_INSERT_ORDER_SQL = """
+    INSERT INTO orders (
+        order_id, symbol, side, order_type, quantity, price, 
+        status, strategy, metadata, created_at, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Columns update_order may change, in _UPDATE_ORDER_SQL parameter order
+_ORDER_UPDATE_FIELDS = ('status', 'price', 'quantity', 'filled_price', 'filled_quantity', 'metadata')
+
+_UPDATE_ORDER_SQL = """
+    UPDATE orders SET
+        status = COALESCE(?, status),
+        price = COALESCE(?, price),
+        quantity = COALESCE(?, quantity),
+        filled_price = COALESCE(?, filled_price),
+        filled_quantity = COALESCE(?, filled_quantity),
+        metadata = COALESCE(?, metadata),
+        updated_at = ?
+    WHERE order_id = ?
+"""
+
+_INSERT_TRADE_SQL = """
+    INSERT INTO trades (
+        trade_id, symbol, side, quantity, price, value,
+        strategy, pnl, commission, order_id, metadata, executed_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Market data is written to one attached database file per UTC day, so old
+# days are dropped by deleting files instead of DELETEing rows. At most one
+# shard (today's) is attached at a time, well under SQLite's attach limit.
+_MARKET_SHARD_PREFIX = "market_"
+
+_MARKET_DATA_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS {schema}.market_data (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        symbol TEXT NOT NULL,
+        price REAL NOT NULL,
+        volume INTEGER,
+        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        bid REAL,
+        ask REAL,
+        open_interest INTEGER,
+        metadata BLOB
+    );
+    CREATE INDEX IF NOT EXISTS {schema}.idx_market_data_symbol_ts ON market_data(symbol, timestamp DESC);
+"""
+
+_INSERT_MARKET_DATA_SQL = """
+    INSERT INTO {schema}.market_data (
+        symbol, price, volume, bid, ask, open_interest, metadata, timestamp
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Upserts update the existing row in place (unlike INSERT OR REPLACE, which
+# deletes it), keeping its id and, for positions, opened_at
+_UPSERT_POSITION_SQL = """
+    INSERT INTO positions (
+        symbol, quantity, avg_price, market_price, pnl,
+        unrealized_pnl, strategy, metadata, opened_at, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(symbol) DO UPDATE SET
+        quantity = excluded.quantity,
+        avg_price = excluded.avg_price,
+        market_price = excluded.market_price,
+        pnl = excluded.pnl,
+        unrealized_pnl = excluded.unrealized_pnl,
+        strategy = excluded.strategy,
+        metadata = excluded.metadata,
+        updated_at = excluded.updated_at
+"""
+
+_UPSERT_DAILY_PERFORMANCE_SQL = """
+    INSERT INTO daily_performance (
+        date, total_pnl, realized_pnl, unrealized_pnl,
+        trades_count, winning_trades, losing_trades,
+        max_drawdown, portfolio_value, metadata
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(date) DO UPDATE SET
+        total_pnl = excluded.total_pnl,
+        realized_pnl = excluded.realized_pnl,
+        unrealized_pnl = excluded.unrealized_pnl,
+        trades_count = excluded.trades_count,
+        winning_trades = excluded.winning_trades,
+        losing_trades = excluded.losing_trades,
+        max_drawdown = excluded.max_drawdown,
+        portfolio_value = excluded.portfolio_value,
+        metadata = excluded.metadata
+"""
+
+_INSERT_RISK_EVENT_SQL = """
+    INSERT INTO risk_events (
+        event_type, symbol, description, severity,
+        action_taken, metadata, timestamp
+    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+def _record(row: sqlite3.Row) -> Dict[str, Any]:
+    """Convert a row to a dict, decoding its metadata column"""
+    record = dict(row)
+    metadata = record['metadata']
+    record['metadata'] = _decode_metadata(metadata) if metadata else {}
+    return record
+
+def _trade_row(trade_data: Dict[str, Any], executed_at: str) -> tuple:
+    """_INSERT_TRADE_SQL parameters for one trade"""
+    return (
+        trade_data.get('trade_id'),
+        trade_data.get('symbol'),
+        trade_data.get('side'),
+        trade_data.get('quantity'),
+        trade_data.get('price'),
+        trade_data.get('value'),
+        trade_data.get('strategy'),
+        trade_data.get('pnl', 0),
+        trade_data.get('commission', 0),
+        trade_data.get('order_id'),
+        _metadata_param(trade_data.get('metadata')),
+        executed_at
+    )
+
 class DatabaseManager:
     """Database manager for trading data storage"""
     
-    def __init__(self, db_path: str = "data/trading_data.db"):
+    def __init__(self, db_path: str = "data/trading_data.db", synchronous: str = "NORMAL"):
+        """
+        Args:
+            db_path: SQLite database file
+            synchronous: SQLite synchronous level; NORMAL is crash-safe under WAL,
+                use FULL if every commit must survive power loss
+        """
         self.logger = TradingLogger(__name__)
         self.db_path = Path(db_path)
+        self.synchronous = synchronous
         self.db_path.parent.mkdir(exist_ok=True)
         self.connection = None
+        
+        # sqlite3 calls block, so they all run on one dedicated thread that
+        # owns the connection; the event loop only awaits the results
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db")
+        
+        # Writes are queued and committed in batches by a single writer task
+        self._write_queue: asyncio.Queue = asyncio.Queue()
+        self._writer_task = None
+        
+        # One reusable cursor per statement text, used only on the database thread
+        self._cursors: Dict[str, sqlite3.Cursor] = {}
+        
+        # Queries use a second, read-only connection on its own thread; under
+        # WAL they see the last commit without waiting for the writer
+        self._read_connection = None
+        self._read_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-read")
+        self._read_cursors: Dict[str, sqlite3.Cursor] = {}
+        
+        # Schema alias of each attached market data shard by UTC day
+        self._attached_days: Dict[str, str] = {}
+        
+        # Daily PnL by date for days other than today (LRU, see get_daily_pnl)
+        self._pnl_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+    
+    async def _run(self, fn, *args):
+        """Run a blocking database call on the database thread"""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+    
+    async def _read(self, fn, *args):
+        """Run a blocking query on the reader thread"""
+        return await asyncio.get_running_loop().run_in_executor(self._read_executor, fn, *args)
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open the connection (runs on the database thread)"""
+        # check_same_thread stays on: the single-worker executor is the only
+        # thread that touches the connection, so no lock is needed around it
+        connection = sqlite3.connect(str(self.db_path), cached_statements=256)
+        connection.row_factory = sqlite3.Row  # Enable dict-like access
+        
+        # WAL lets readers run alongside the writer and only fsyncs at checkpoints
+        connection.executescript(f"""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous={self.synchronous};
+            PRAGMA temp_store=MEMORY;
+            PRAGMA cache_size=-65536;
+            PRAGMA mmap_size=268435456;
+            PRAGMA busy_timeout=5000;
+        """)
+        return connection
+    
+    def _connect_reader(self) -> sqlite3.Connection:
+        """Open the read-only connection (runs on the reader thread)"""
+        connection = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True,
+                                     cached_statements=256)
+        connection.row_factory = sqlite3.Row
+        connection.executescript("""
+            PRAGMA temp_store=MEMORY;
+            PRAGMA cache_size=-65536;
+            PRAGMA mmap_size=268435456;
+            PRAGMA busy_timeout=5000;
+        """)
+        return connection
+    
+    def _execute_batch(self, batch: List[tuple]) -> List[Any]:
+        """
+        Execute queued writes in one transaction (runs on the database thread)
+        
+        Args:
+            batch: (sql, params, many, future) tuples; ``many`` writes
+                take a sequence of parameter rows for executemany. ``sql`` may
+                be a callable that returns the statement, called here first
+            
+        Returns:
+            (row count, last inserted row id) or exception for each write, in order
+        """
+        outcomes = []
+        for sql, params, many, _ in batch:
+            try:
+                if callable(sql):
+                    sql = sql()
+                if many:
+                    outcomes.append((self._execute_many(sql, params), None))
+                else:
+                    cursor = self._cursor(sql).execute(sql, params)
+                    outcomes.append((cursor.rowcount, cursor.lastrowid))
+            except Exception as e:
+                # A failed statement does not abort the rest of the transaction
+                outcomes.append(e)
+        self.connection.commit()
+        return outcomes
+    
+    def _execute_many(self, sql: str, rows) -> int:
+        """executemany inside a savepoint so a bad row undoes the whole call"""
+        self.connection.execute("SAVEPOINT bulk_write")
+        try:
+            count = self._cursor(sql).executemany(sql, rows).rowcount
+        except Exception:
+            self.connection.execute("ROLLBACK TO bulk_write")
+            raise
+        finally:
+            self.connection.execute("RELEASE bulk_write")
+        return count
+    
+    async def _writer_loop(self):
+        """Commit queued writes, batching whatever piled up during the last commit"""
+        loop = asyncio.get_running_loop()
+        next_optimize = loop.time() + _OPTIMIZE_INTERVAL
+        while True:
+            batch = [await self._write_queue.get()]
+            while len(batch) < _WRITE_BATCH_SIZE and not self._write_queue.empty():
+                batch.append(self._write_queue.get_nowait())
+            
+            try:
+                outcomes = await self._run(self._execute_batch, batch)
+            except Exception as e:
+                outcomes = [e] * len(batch)
+            
+            for (*_, future), outcome in zip(batch, outcomes):
+                # The caller may have been cancelled while waiting
+                if not future.done():
+                    if isinstance(outcome, Exception):
+                        future.set_exception(outcome)
+                    else:
+                        future.set_result(outcome)
+                self._write_queue.task_done()
+            
+            # Keep planner statistics current during long sessions
+            if loop.time() >= next_optimize:
+                next_optimize = loop.time() + _OPTIMIZE_INTERVAL
+                try:
+                    await self._run(self.connection.execute, "PRAGMA optimize")
+                except Exception as e:
+                    self.logger.logger.warning(f"PRAGMA optimize failed: {e}")
+    
+    async def _write(self, sql: Union[str, Callable[[], str]], params=(), many: bool = False,
+                     row_id: bool = False) -> Optional[int]:
+        """
+        Queue a write statement and wait until it is committed
+        
+        Args:
+            sql: Statement to execute, or a callable returning it that the
+                database thread calls when the write runs
+            params: Parameters, or a sequence of parameter rows if ``many``
+            many: Execute once per row with executemany
+            row_id: Return the inserted row's id instead of the row count
+        
+        Returns:
+            Number of rows affected, or the inserted row id
+        """
+        if self._writer_task is None:
+            raise RuntimeError("Database is not initialized")
+        
+        future = asyncio.get_running_loop().create_future()
+        self._write_queue.put_nowait((sql, params, many, future))
+        row_count, last_row_id = await future
+        return last_row_id if row_id else row_count
+    
+    async def flush(self):
+        """Wait until every write queued so far has been committed"""
+        await self._write_queue.join()
+    
+    def _cursor(self, sql: str) -> sqlite3.Cursor:
+        """Cursor dedicated to one statement (runs on the database thread)"""
+        cursor = self._cursors.get(sql)
+        if cursor is None:
+            cursor = self._cursors[sql] = self.connection.cursor()
+        return cursor
+    
+    def _market_shard_path(self, day: str) -> Path:
+        """Database file holding one UTC day's market data"""
+        return self.db_path.with_name(f"{_MARKET_SHARD_PREFIX}{day}.db")
+    
+    def _attach_market_day(self, day: str) -> str:
+        """
+        Attach the market data shard for a day, creating it if needed
+        (runs on the database thread)
+        
+        Args:
+            day: UTC date (YYYY-MM-DD)
+            
+        Returns:
+            Schema alias of the shard
+        """
+        alias = self._attached_days.get(day)
+        if alias is None:
+            # Only the current day is written to, so earlier shards are let go
+            for attached_day in list(self._attached_days):
+                self._detach_market_day(attached_day)
+            
+            # ATTACH and DETACH cannot run inside a transaction, so the
+            # writes batched so far are committed first
+            if self.connection.in_transaction:
+                self.connection.commit()
+            
+            alias = f"md_{day.replace('-', '')}"
+            self.connection.execute(f"ATTACH DATABASE ? AS {alias}",
+                                    (str(self._market_shard_path(day)),))
+            self.connection.executescript(
+                f"PRAGMA {alias}.journal_mode=WAL;"
+                f"PRAGMA {alias}.synchronous={self.synchronous};"
+                + _MARKET_DATA_TABLE_SQL.format(schema=alias)
+            )
+            self._attached_days[day] = alias
+        return alias
+    
+    def _market_data_sql(self, day: str) -> str:
+        """Insert statement for a day's shard, attaching it first if needed (runs on the database thread)"""
+        return _INSERT_MARKET_DATA_SQL.format(schema=self._attach_market_day(day))
+    
+    def _detach_market_day(self, day: str):
+        """Detach a market data shard (runs on the database thread)"""
+        alias = self._attached_days.pop(day)
+        cursor = self._cursors.pop(_INSERT_MARKET_DATA_SQL.format(schema=alias), None)
+        if cursor is not None:
+            cursor.close()
+        self.connection.execute(f"DETACH DATABASE {alias}")
+    
+    def _drop_market_days(self, before: str) -> int:
+        """
+        Delete the market data shards of days before a date
+        (runs on the database thread)
+        
+        Args:
+            before: First UTC date (YYYY-MM-DD) to keep
+            
+        Returns:
+            Number of shards deleted
+        """
+        dropped = 0
+        for path in self.db_path.parent.glob(f"{_MARKET_SHARD_PREFIX}*.db"):
+            day = path.stem[len(_MARKET_SHARD_PREFIX):]
+            try:
+                date.fromisoformat(day)
+            except ValueError:
+                continue
+            if day >= before:
+                continue
+            
+            if day in self._attached_days:
+                self._detach_market_day(day)
+            for suffix in ("", "-wal", "-shm"):
+                Path(f"{path}{suffix}").unlink(missing_ok=True)
+            dropped += 1
+        return dropped
+    
+    def _fetch_records(self, sql: str, params=()) -> List[Dict[str, Any]]:
+        """
+        Run a query and return its rows as dicts with decoded metadata
+        (runs on the reader thread, so decoding stays off the event loop)
+        """
+        cursor = self._read_cursors.get(sql)
+        if cursor is None:
+            cursor = self._read_cursors[sql] = self._read_connection.cursor()
+        return [_record(row) for row in cursor.execute(sql, params)]
     
     async def initialize(self) -> bool:
         """
@@ -29,10 +601,10 @@ class DatabaseManager:
             True if initialization successful
         """
         try:
-            self.connection = sqlite3.connect(str(self.db_path))
-            self.connection.row_factory = sqlite3.Row  # Enable dict-like access
-            
-            await self._create_tables()
+            self.connection = await self._run(self._connect)
+            await self._run(self._create_tables)
+            self._read_connection = await self._read(self._connect_reader)
+            self._writer_task = asyncio.create_task(self._writer_loop())
             
             self.logger.logger.info(f"Database initialized: {self.db_path}")
             return True
@@ -41,135 +613,12 @@ class DatabaseManager:
             self.logger.logger.error(f"Failed to initialize database: {e}")
             return False
     
-    async def _create_tables(self):
-        """Create all required database tables"""
-        cursor = self.connection.cursor()
-        
-        # Orders table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS orders (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                order_id TEXT UNIQUE,
-                symbol TEXT NOT NULL,
-                side TEXT NOT NULL,  -- BUY/SELL
-                order_type TEXT NOT NULL,  -- MARKET/LIMIT
-                quantity INTEGER NOT NULL,
-                price REAL,
-                status TEXT NOT NULL,  -- PENDING/OPEN/FILLED/CANCELLED
-                strategy TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                filled_price REAL,
-                filled_quantity INTEGER DEFAULT 0,
-                metadata TEXT  -- JSON string for additional data
-            )
-        """)
-        
-        # Trades table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS trades (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                trade_id TEXT UNIQUE,
-                symbol TEXT NOT NULL,
-                side TEXT NOT NULL,
-                quantity INTEGER NOT NULL,
-                price REAL NOT NULL,
-                value REAL NOT NULL,
-                strategy TEXT,
-                pnl REAL DEFAULT 0,
-                commission REAL DEFAULT 0,
-                executed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                order_id TEXT,
-                metadata TEXT,
-                FOREIGN KEY (order_id) REFERENCES orders (order_id)
-            )
-        """)
-        
-        # Positions table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS positions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                symbol TEXT UNIQUE,
-                quantity INTEGER NOT NULL,
-                avg_price REAL NOT NULL,
-                market_price REAL,
-                pnl REAL DEFAULT 0,
-                unrealized_pnl REAL DEFAULT 0,
-                strategy TEXT,
-                opened_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                metadata TEXT
-            )
-        """)
-        
-        # Market data table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS market_data (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                symbol TEXT NOT NULL,
-                price REAL NOT NULL,
-                volume INTEGER,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                bid REAL,
-                ask REAL,
-                open_interest INTEGER,
-                metadata TEXT
-            )
-        """)
-        
-        # Daily performance table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS daily_performance (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                date DATE UNIQUE,
-                total_pnl REAL DEFAULT 0,
-                realized_pnl REAL DEFAULT 0,
-                unrealized_pnl REAL DEFAULT 0,
-                trades_count INTEGER DEFAULT 0,
-                winning_trades INTEGER DEFAULT 0,
-                losing_trades INTEGER DEFAULT 0,
-                max_drawdown REAL DEFAULT 0,
-                portfolio_value REAL DEFAULT 0,
-                metadata TEXT
-            )
-        """)
-        
-        # Strategy performance table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS strategy_performance (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                strategy_name TEXT NOT NULL,
-                date DATE,
-                pnl REAL DEFAULT 0,
-                trades_count INTEGER DEFAULT 0,
-                win_rate REAL DEFAULT 0,
-                avg_win REAL DEFAULT 0,
-                avg_loss REAL DEFAULT 0,
-                max_drawdown REAL DEFAULT 0,
-                sharpe_ratio REAL DEFAULT 0,
-                metadata TEXT,
-                UNIQUE(strategy_name, date)
-            )
-        """)
-        
-        # Risk events table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS risk_events (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                event_type TEXT NOT NULL,  -- POSITION_LIMIT/LOSS_LIMIT/VOLATILITY etc.
-                symbol TEXT,
-                description TEXT,
-                severity TEXT,  -- LOW/MEDIUM/HIGH/CRITICAL
-                action_taken TEXT,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                metadata TEXT
-            )
-        """)
-        
-        self.connection.commit()
+    def _create_tables(self):
+        """Create all required database tables (runs on the database thread)"""
+        self.connection.executescript(_SCHEMA_SQL)
         self.logger.logger.info("Database tables created/verified")
     
-    async def insert_order(self, order_data: Dict[str, Any]) -> bool:
+    async def insert_order(self, order_data: Dict[str, Any]) -> Optional[int]:
         """
         Insert order record
         
@@ -177,17 +626,11 @@ class DatabaseManager:
             order_data: Order information
             
         Returns:
-            True if insertion successful
+            Row id of the new order, or None if insertion failed
         """
         try:
-            cursor = self.connection.cursor()
-            
-            cursor.execute("""
-                INSERT INTO orders (
-                    order_id, symbol, side, order_type, quantity, price, 
-                    status, strategy, metadata
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            timestamp = _utc_now()
+            return await self._write(_INSERT_ORDER_SQL, (
                 order_data.get('order_id'),
                 order_data.get('symbol'),
                 order_data.get('side'),
@@ -196,15 +639,14 @@ class DatabaseManager:
                 order_data.get('price'),
                 order_data.get('status', 'PENDING'),
                 order_data.get('strategy'),
-                json.dumps(order_data.get('metadata', {}))
-            ))
-            
-            self.connection.commit()
-            return True
+                _metadata_param(order_data.get('metadata')),
+                timestamp,
+                timestamp
+            ), row_id=True)
             
         except Exception as e:
             self.logger.logger.error(f"Error inserting order: {e}")
-            return False
+            return None
     
     async def update_order(self, order_id: str, update_data: Dict[str, Any]) -> bool:
         """
@@ -218,35 +660,28 @@ class DatabaseManager:
             True if update successful
         """
         try:
-            cursor = self.connection.cursor()
+            unknown = update_data.keys() - _ORDER_UPDATE_FIELDS
+            if unknown:
+                raise ValueError(f"Cannot update order fields: {', '.join(sorted(unknown))}")
             
-            # Build dynamic update query
-            set_clauses = []
-            values = []
-            
-            for field, value in update_data.items():
-                if field == 'metadata':
-                    value = json.dumps(value)
-                set_clauses.append(f"{field} = ?")
-                values.append(value)
-            
-            if not set_clauses:
+            if not update_data:
                 return True
             
-            set_clauses.append("updated_at = CURRENT_TIMESTAMP")
+            # One fixed statement; fields left as None keep their current value
+            values = [update_data.get(field) for field in _ORDER_UPDATE_FIELDS]
+            if values[-1] is not None:
+                values[-1] = _encode_metadata(values[-1])
+            values.append(_utc_now())
             values.append(order_id)
             
-            query = f"UPDATE orders SET {', '.join(set_clauses)} WHERE order_id = ?"
-            cursor.execute(query, values)
-            
-            self.connection.commit()
+            await self._write(_UPDATE_ORDER_SQL, values)
             return True
             
         except Exception as e:
             self.logger.logger.error(f"Error updating order {order_id}: {e}")
             return False
     
-    async def insert_trade(self, trade_data: Dict[str, Any]) -> bool:
+    async def insert_trade(self, trade_data: Dict[str, Any]) -> Optional[int]:
         """
         Insert trade record
         
@@ -254,36 +689,73 @@ class DatabaseManager:
             trade_data: Trade information
             
         Returns:
-            True if insertion successful
+            Row id of the new trade, or None if insertion failed
         """
         try:
-            cursor = self.connection.cursor()
-            
-            cursor.execute("""
-                INSERT INTO trades (
-                    trade_id, symbol, side, quantity, price, value,
-                    strategy, pnl, commission, order_id, metadata
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                trade_data.get('trade_id'),
-                trade_data.get('symbol'),
-                trade_data.get('side'),
-                trade_data.get('quantity'),
-                trade_data.get('price'),
-                trade_data.get('value'),
-                trade_data.get('strategy'),
-                trade_data.get('pnl', 0),
-                trade_data.get('commission', 0),
-                trade_data.get('order_id'),
-                json.dumps(trade_data.get('metadata', {}))
-            ))
-            
-            self.connection.commit()
+            trade_id = await self._write(_INSERT_TRADE_SQL, _trade_row(trade_data, _utc_now()), row_id=True)
             self.logger.log_trade(trade_data)
-            return True
+            return trade_id
             
         except Exception as e:
             self.logger.logger.error(f"Error inserting trade: {e}")
+            return None
+    
+    async def insert_trades_bulk(self, trades: List[Dict[str, Any]]) -> bool:
+        """
+        Insert several trade records with one prepared statement
+        
+        Args:
+            trades: Trade information, one dict per trade
+            
+        Returns:
+            True if every trade was inserted; on failure none are
+        """
+        try:
+            # The batch shares one timestamp
+            executed_at = _utc_now()
+            await self._write(_INSERT_TRADE_SQL, [_trade_row(trade_data, executed_at) for trade_data in trades],
+                              many=True)
+            
+            for trade_data in trades:
+                self.logger.log_trade(trade_data)
+            return True
+            
+        except Exception as e:
+            self.logger.logger.error(f"Error inserting trades: {e}")
+            return False
+    
+    async def insert_market_data_bulk(self, ticks: List[Dict[str, Any]]) -> bool:
+        """
+        Insert several market data records with one prepared statement
+        
+        Args:
+            ticks: Market data, one dict per tick
+            
+        Returns:
+            True if every tick was inserted; on failure none are
+        """
+        try:
+            # The batch shares one UTC timestamp, whose day picks the shard.
+            # The shard is resolved by the writer right before the insert, so
+            # a day rollover or cleanup in between cannot detach it first.
+            timestamp = _utc_now()
+            await self._write(partial(self._market_data_sql, timestamp[:10]), [
+                (
+                    tick.get('symbol'),
+                    tick.get('price', tick.get('ltp')),
+                    tick.get('volume'),
+                    tick.get('bid'),
+                    tick.get('ask'),
+                    tick.get('open_interest', tick.get('oi')),
+                    _metadata_param(tick.get('metadata')),
+                    timestamp
+                )
+                for tick in ticks
+            ], many=True)
+            return True
+            
+        except Exception as e:
+            self.logger.logger.error(f"Error inserting market data: {e}")
             return False
     
     async def upsert_position(self, position_data: Dict[str, Any]) -> bool:
@@ -297,14 +769,8 @@ class DatabaseManager:
             True if operation successful
         """
         try:
-            cursor = self.connection.cursor()
-            
-            cursor.execute("""
-                INSERT OR REPLACE INTO positions (
-                    symbol, quantity, avg_price, market_price, pnl,
-                    unrealized_pnl, strategy, metadata
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            timestamp = _utc_now()
+            await self._write(_UPSERT_POSITION_SQL, (
                 position_data.get('symbol'),
                 position_data.get('quantity'),
                 position_data.get('avg_price'),
@@ -312,10 +778,10 @@ class DatabaseManager:
                 position_data.get('pnl', 0),
                 position_data.get('unrealized_pnl', 0),
                 position_data.get('strategy'),
-                json.dumps(position_data.get('metadata', {}))
+                _metadata_param(position_data.get('metadata')),
+                timestamp,
+                timestamp
             ))
-            
-            self.connection.commit()
             self.logger.log_position_update(position_data)
             return True
             
@@ -331,17 +797,7 @@ class DatabaseManager:
             List of position records
         """
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT * FROM positions WHERE quantity != 0")
-            
-            positions = []
-            for row in cursor.fetchall():
-                position = dict(row)
-                if position['metadata']:
-                    position['metadata'] = json.loads(position['metadata'])
-                positions.append(position)
-            
-            return positions
+            return await self._read(self._fetch_records, "SELECT * FROM positions WHERE quantity != 0")
             
         except Exception as e:
             self.logger.logger.error(f"Error getting positions: {e}")
@@ -359,27 +815,17 @@ class DatabaseManager:
             List of order records
         """
         try:
-            cursor = self.connection.cursor()
-            
             if status:
-                cursor.execute(
+                return await self._read(
+                    self._fetch_records,
                     "SELECT * FROM orders WHERE status = ? ORDER BY created_at DESC LIMIT ?",
                     (status, limit)
                 )
-            else:
-                cursor.execute(
-                    "SELECT * FROM orders ORDER BY created_at DESC LIMIT ?",
-                    (limit,)
-                )
-            
-            orders = []
-            for row in cursor.fetchall():
-                order = dict(row)
-                if order['metadata']:
-                    order['metadata'] = json.loads(order['metadata'])
-                orders.append(order)
-            
-            return orders
+            return await self._read(
+                self._fetch_records,
+                "SELECT * FROM orders ORDER BY created_at DESC LIMIT ?",
+                (limit,)
+            )
             
         except Exception as e:
             self.logger.logger.error(f"Error getting orders: {e}")
@@ -396,26 +842,42 @@ class DatabaseManager:
             Daily PnL data
         """
         try:
+            # A trading day supplied by callers, so today is the local (exchange) date,
+            # unlike the UTC row timestamps
+            today = date.today().strftime('%Y-%m-%d')
             if not date_str:
-                date_str = date.today().strftime('%Y-%m-%d')
-            
-            cursor = self.connection.cursor()
-            cursor.execute(
+                date_str = today
+            
+            # Today's row is still being updated, so it is never served from the cache
+            cacheable = date_str != today
+            if cacheable:
+                cached = self._pnl_cache.get(date_str)
+                if cached is not None:
+                    self._pnl_cache.move_to_end(date_str)
+                    return dict(cached)
+            
+            rows = await self._read(
+                self._fetch_records,
                 "SELECT * FROM daily_performance WHERE date = ?",
                 (date_str,)
             )
-            
-            row = cursor.fetchone()
-            if row:
-                return dict(row)
+            if rows:
+                pnl = rows[0]
             else:
-                return {
+                pnl = {
                     'date': date_str,
                     'total_pnl': 0,
                     'realized_pnl': 0,
                     'unrealized_pnl': 0,
                     'trades_count': 0
                 }
+            
+            if cacheable:
+                self._pnl_cache[date_str] = pnl
+                if len(self._pnl_cache) > _PNL_CACHE_SIZE:
+                    self._pnl_cache.popitem(last=False)
+                return dict(pnl)
+            return pnl
                 
         except Exception as e:
             self.logger.logger.error(f"Error getting daily PnL: {e}")
@@ -433,15 +895,7 @@ class DatabaseManager:
             True if update successful
         """
         try:
-            cursor = self.connection.cursor()
-            
-            cursor.execute("""
-                INSERT OR REPLACE INTO daily_performance (
-                    date, total_pnl, realized_pnl, unrealized_pnl,
-                    trades_count, winning_trades, losing_trades,
-                    max_drawdown, portfolio_value, metadata
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            await self._write(_UPSERT_DAILY_PERFORMANCE_SQL, (
                 date_str,
                 performance_data.get('total_pnl', 0),
                 performance_data.get('realized_pnl', 0),
@@ -451,10 +905,9 @@ class DatabaseManager:
                 performance_data.get('losing_trades', 0),
                 performance_data.get('max_drawdown', 0),
                 performance_data.get('portfolio_value', 0),
-                json.dumps(performance_data.get('metadata', {}))
+                _metadata_param(performance_data.get('metadata'))
             ))
-            
-            self.connection.commit()
+            self._pnl_cache.pop(date_str, None)
             return True
             
         except Exception as e:
@@ -472,23 +925,15 @@ class DatabaseManager:
             True if logging successful
         """
         try:
-            cursor = self.connection.cursor()
-            
-            cursor.execute("""
-                INSERT INTO risk_events (
-                    event_type, symbol, description, severity,
-                    action_taken, metadata
-                ) VALUES (?, ?, ?, ?, ?, ?)
-            """, (
+            await self._write(_INSERT_RISK_EVENT_SQL, (
                 event_data.get('event_type'),
                 event_data.get('symbol'),
                 event_data.get('description'),
                 event_data.get('severity', 'MEDIUM'),
                 event_data.get('action_taken'),
-                json.dumps(event_data.get('metadata', {}))
+                _metadata_param(event_data.get('metadata')),
+                _utc_now()
             ))
-            
-            self.connection.commit()
             self.logger.log_risk_event(event_data)
             return True
             
@@ -504,16 +949,19 @@ class DatabaseManager:
             days_to_keep: Number of days of data to retain
         """
         try:
-            cursor = self.connection.cursor()
-            
-            # Clean up old market data
-            cursor.execute("""
-                DELETE FROM market_data 
-                WHERE timestamp < datetime('now', '-{} days')
-            """.format(days_to_keep))
-            
-            deleted_count = cursor.rowcount
-            self.connection.commit()
+            # Timestamps and shard days are UTC like CURRENT_TIMESTAMP
+            cutoff = datetime.now(timezone.utc) - timedelta(days=days_to_keep)
+            
+            # Whole days are dropped by deleting their shard files
+            dropped_days = await self._run(self._drop_market_days, cutoff.strftime('%Y-%m-%d'))
+            if dropped_days > 0:
+                self.logger.logger.info(f"Removed {dropped_days} old market data day files")
+            
+            # Rows written to the main database before sharding
+            deleted_count = await self._write(
+                "DELETE FROM market_data WHERE timestamp < ?",
+                (cutoff.strftime('%Y-%m-%d %H:%M:%S'),)
+            )
             
             if deleted_count > 0:
                 self.logger.logger.info(f"Cleaned up {deleted_count} old market data records")
@@ -524,9 +972,28 @@ class DatabaseManager:
     async def close(self):
         """Close database connection"""
         try:
+            if self._writer_task:
+                await self.flush()
+                self._writer_task.cancel()
+                self._writer_task = None
+            
+            # The reader goes first so it cannot hold back the checkpoint below
+            if self._read_connection:
+                await self._read(self._read_connection.close)
+                self._read_cursors.clear()
+                self._read_connection = None
+            self._read_executor.shutdown(wait=False)
+            
             if self.connection:
-                self.connection.close()
+                # Refresh planner statistics for the indexes, then fold the WAL
+                # back into the database files so the next start has nothing to replay
+                await self._run(self.connection.execute, "PRAGMA optimize")
+                await self._run(self.connection.execute, "PRAGMA wal_checkpoint(TRUNCATE)")
+                await self._run(self.connection.close)
+                self._cursors.clear()
+                self.connection = None
                 self.logger.logger.info("Database connection closed")
+            self._executor.shutdown(wait=False)
                 
         except Exception as e:
             self.logger.logger.error(f"Error closing database: {e}")
@@ -3,6 +3,7 @@ Helper utilities for the trading bot
 """
 
 import asyncio
+import os
 from datetime import datetime, time
 import pytz
 from typing import Optional, Dict, Any, List
@@ -272,3 +273,51 @@ def get_expiry_dates() -> List[str]:
         expiries.append(expiry_date.strftime('%Y-%m-%d'))
     
     return expiries
+
+def install_uvloop() -> bool:
+    """
+    Use uvloop as the asyncio event loop policy when it is available
+    
+    Must be called before the event loop is created (i.e. before asyncio.run).
+    
+    Returns:
+        True if uvloop was installed
+    """
+    import sys
+    
+    if sys.platform == 'win32':  # uvloop does not support Windows
+        return False
+    
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+def tail_lines(path: str, count: int = 5, block_size: int = 4096) -> List[str]:
+    """
+    Return the last non-empty lines of a file without reading all of it
+    
+    Args:
+        path: File to read
+        count: Number of lines to return
+        block_size: Bytes read per step, backwards from the end
+        
+    Returns:
+        Up to ``count`` lines, oldest first
+    """
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        data = b''
+        pos = size
+        # Read backwards block by block until enough lines are buffered
+        while pos > 0 and data.count(b'\n') <= count:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    lines = [line for line in data.split(b'\n') if line.strip()]
+    return [line.decode('utf-8', errors='replace') for line in lines[-count:]]
@@ -21,10 +21,6 @@ def setup_logger(name: str, level: str = "INFO") -> logging.Logger:
         Configured logger instance
     """
     
-    # Create logs directory if it doesn't exist
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
-    
     # Create logger
     logger = logging.getLogger(name)
     logger.setLevel(getattr(logging, level.upper()))
@@ -33,6 +29,10 @@ def setup_logger(name: str, level: str = "INFO") -> logging.Logger:
     if logger.handlers:
         return logger
     
+    # Create logs directory if it doesn't exist
+    log_dir = Path("logs")
+    log_dir.mkdir(exist_ok=True)
+    
     # Create formatters
     file_formatter = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s'
@@ -0,0 +1,123 @@
+"""
+Tests for DatabaseManager's write queue, reader connection and market data shards
+"""
+
+import asyncio
+import os
+import sqlite3
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.data.database as database
+from src.data.database import DatabaseManager
+
+
+def _order(order_id, **fields):
+    return {'order_id': order_id, 'symbol': 'NIFTY24000CE', 'side': 'BUY',
+            'order_type': 'LIMIT', 'quantity': 50, 'price': 100.0, **fields}
+
+
+def _trade(trade_id, **fields):
+    return {'trade_id': trade_id, 'symbol': 'NIFTY24000CE', 'side': 'BUY',
+            'quantity': 50, 'price': 100.0, 'value': 5000.0, **fields}
+
+
+def _run_with_db(db_path, scenario):
+    """Run ``scenario(db)`` against an initialized database, closing it afterwards"""
+    async def main():
+        db = DatabaseManager(str(db_path))
+        assert await db.initialize()
+        try:
+            return await scenario(db)
+        finally:
+            await db.close()
+    return asyncio.run(main())
+
+
+def _count(path, table):
+    conn = sqlite3.connect(str(path))
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "trading_data.db"
+
+
+def test_duplicate_order_fails_only_its_own_caller(db_path):
+    async def scenario(db):
+        # Queued together, so the writer commits them in one batch
+        return await asyncio.gather(
+            db.insert_order(_order('A')),
+            db.insert_order(_order('A')),
+            db.insert_order(_order('B')),
+            db.upsert_position({'symbol': 'NIFTY24000CE', 'quantity': 50, 'avg_price': 100.0}),
+        ), await db.get_orders(), await db.get_positions()
+
+    (first, duplicate, other, position_ok), orders, positions = _run_with_db(db_path, scenario)
+
+    assert isinstance(first, int) and isinstance(other, int)
+    assert duplicate is None
+    assert position_ok is True
+    assert sorted(order['order_id'] for order in orders) == ['A', 'B']
+    assert len(positions) == 1
+
+
+def test_bad_row_in_trades_bulk_inserts_nothing(db_path):
+    async def scenario(db):
+        # price is NOT NULL, so the second row fails the whole executemany
+        return await db.insert_trades_bulk([_trade('T1'), _trade('T2', price=None), _trade('T3')])
+
+    assert _run_with_db(db_path, scenario) is False
+    assert _count(db_path, 'trades') == 0
+
+
+def test_market_data_across_utc_midnight_lands_in_both_day_files(db_path, monkeypatch):
+    timestamps = iter(['2026-01-01 23:59:59.999999', '2026-01-02 00:00:00.000001'])
+    monkeypatch.setattr(database, '_utc_now', lambda: next(timestamps))
+
+    async def scenario(db):
+        before = await db.insert_market_data_bulk([{'symbol': 'NIFTY', 'ltp': 24000.0}] * 3)
+        after = await db.insert_market_data_bulk([{'symbol': 'NIFTY', 'ltp': 24001.0}] * 2)
+        return before, after
+
+    assert _run_with_db(db_path, scenario) == (True, True)
+    assert _count(db_path.with_name('market_2026-01-01.db'), 'market_data') == 3
+    assert _count(db_path.with_name('market_2026-01-02.db'), 'market_data') == 2
+    assert _count(db_path, 'market_data') == 0
+
+
+def test_reads_see_committed_writes(db_path):
+    async def scenario(db):
+        await db.insert_order(_order('A', metadata={'signal': 'breakout'}))
+        inserted = await db.get_orders()
+        await db.update_order('A', {'status': 'FILLED', 'filled_price': 101.5})
+        updated = await db.get_orders(status='FILLED')
+        return inserted, updated
+
+    inserted, updated = _run_with_db(db_path, scenario)
+
+    assert [order['status'] for order in inserted] == ['PENDING']
+    assert inserted[0]['metadata'] == {'signal': 'breakout'}
+    assert len(updated) == 1 and updated[0]['filled_price'] == 101.5
+
+
+def test_close_flushes_queued_writes_and_truncates_the_wal(db_path):
+    async def scenario(db):
+        # Not awaited: close() must still commit it
+        task = asyncio.ensure_future(db.insert_order(_order('A')))
+        await asyncio.sleep(0)
+        return task
+
+    _run_with_db(db_path, scenario)
+
+    assert _count(db_path, 'orders') == 1
+    wal = db_path.with_name(db_path.name + '-wal')
+    assert not wal.exists() or wal.stat().st_size == 0